@@ -0,0 +1,88 @@
+"""
+Бенчмарк черг з пріоритетом для task_3.dijkstra на графах різної форми.
+
+Приклад:
+    python bench_task_3.py --repeat 3 --json bench_task_3.json
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+import networkx as nx
+
+import task_3
+
+QUEUE_NAMES = ["heapq", "indexed", "pairing", "dial"]
+
+
+def _weighted(G, max_weight, seed):
+    rnd = random.Random(seed)
+    for _, _, data in G.edges(data=True):
+        data["weight"] = rnd.randint(1, max_weight)
+    return G
+
+
+def graph_shapes(scale=1.0, max_weight=10, seed=42):
+    """Розріджений випадковий, щільний випадковий і решітка (дорожня мережа в мініатюрі)."""
+    n_sparse = int(20_000 * scale)
+    n_dense = int(1_200 * scale)
+    side = int(150 * scale ** 0.5)
+    return {
+        "sparse": _weighted(nx.gnm_random_graph(n_sparse, 4 * n_sparse, seed=seed), max_weight, seed),
+        "dense": _weighted(nx.gnp_random_graph(n_dense, 0.3, seed=seed), max_weight, seed),
+        "grid": _weighted(nx.convert_node_labels_to_integers(nx.grid_2d_graph(side, side)), max_weight, seed),
+    }
+
+
+def run(graphs, queues, repeat=3, csr=False):
+    results = []
+    for shape, G in graphs.items():
+        g = task_3.CSRGraph.from_networkx(G) if csr else G
+        reference = None
+        for queue in queues:
+            best = float("inf")
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                dist, _ = task_3.dijkstra(g, 0, queue)
+                best = min(best, time.perf_counter() - t0)
+            if reference is None:
+                reference = dist
+            elif dist != reference:
+                raise AssertionError(f"{shape}/{queue}: відстані відрізняються від {queues[0]}")
+            results.append({"shape": shape, "nodes": G.number_of_nodes(), "edges": G.number_of_edges(),
+                             "queue": queue, "csr": csr, "seconds": best})
+    return results
+
+
+def print_report(results):
+    for shape in dict.fromkeys(r["shape"] for r in results):
+        rows = [r for r in results if r["shape"] == shape]
+        winner = min(rows, key=lambda r: r["seconds"])
+        print(f"\n{shape}: n={rows[0]['nodes']:,}, m={rows[0]['edges']:,}")
+        for r in rows:
+            mark = "  <- найшвидша" if r is winner else ""
+            print(f"  {r['queue']:>8}: {r['seconds'] * 1000:9.1f} ms{mark}")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--queues", nargs="+", default=QUEUE_NAMES, choices=QUEUE_NAMES)
+    p.add_argument("--scale", type=float, default=1.0, help="множник розміру графів")
+    p.add_argument("--max-weight", type=int, default=10)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--csr", action="store_true", help="запускати на CSRGraph замість networkx")
+    p.add_argument("--json")
+    args = p.parse_args(argv)
+
+    results = run(graph_shapes(args.scale, args.max_weight), args.queues, args.repeat, args.csr)
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
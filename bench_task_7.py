@@ -0,0 +1,152 @@
+"""
+Бенчмарк збіжності task_7: кидки/с, пікова RSS і RMSE для різних N, бекендів і кількості процесів.
+
+Приклад:
+    python bench_task_7.py --decades 3 7 --backends python numpy parallel --workers 1 2 4 \
+        --json bench.json --csv bench.csv --plot bench.png
+    python bench_task_7.py --baseline bench.json     # порівняння з попередньою версією
+"""
+import argparse
+import csv
+import json
+import multiprocessing as mp
+import sys
+import time
+
+import task_7
+
+
+def _peak_rss_mb():
+    """Пікова RSS процесу та його дочірніх процесів (МБ), або None без модуля resource."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    scale = 1 if sys.platform == "darwin" else 1024     # ru_maxrss: байти на macOS, КБ на Linux
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak * scale / 2**20
+
+
+def _run_one(queue, n, backend, workers, seed):
+    task_7.simulate_two_dice(1, backend=backend, n_workers=workers)   # прогрів: ліниві імпорти numpy
+    t0 = time.perf_counter()
+    counts = task_7.simulate_two_dice(n, seed=seed, backend=backend, n_workers=workers)
+    elapsed = time.perf_counter() - t0
+    _, rmse = task_7.build_table(counts, n)
+    queue.put({
+        "n": n, "backend": backend, "workers": workers, "seconds": elapsed,
+        "rolls_per_sec": n / elapsed if elapsed > 0 else float("inf"),
+        "rmse": rmse, "peak_rss_mb": _peak_rss_mb(),
+    })
+
+
+def measure(n, backend, workers=None, seed=123):
+    """Один замір у свіжому процесі, щоб пікова RSS не «успадковувалась» від попередніх."""
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run_one, args=(queue, n, backend, workers, seed))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def run_suite(ns, backends, workers_list, max_python_n, seed=123):
+    results = []
+    for n in ns:
+        for backend in backends:
+            if backend == "python" and n > max_python_n:
+                continue                                # чистий Python на 10^8+ — години
+            for workers in (workers_list if backend == "parallel" else [None]):
+                r = measure(n, backend, workers, seed)
+                print(f"N={n:>13,} {backend:>8} w={workers or '-':>2}  "
+                      f"{r['rolls_per_sec']:>14,.0f} rolls/s  RMSE={r['rmse']:.2e}  "
+                      f"RSS={r['peak_rss_mb'] or float('nan'):.1f} MB")
+                results.append(r)
+    return results
+
+
+def _key(r):
+    return r["n"], r["backend"], r["workers"]
+
+
+def compare(results, baseline, tolerance):
+    """Повертає заміри, де пропускна здатність впала більше ніж на tolerance відносно baseline."""
+    base = {_key(r): r for r in baseline}
+    regressions = []
+    for r in results:
+        b = base.get(_key(r))
+        if b and r["rolls_per_sec"] < b["rolls_per_sec"] * (1.0 - tolerance):
+            regressions.append((r, b))
+    return regressions
+
+
+def write_csv(results, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def plot(results, path):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, (ax_err, ax_time) = plt.subplots(1, 2, figsize=(12, 5))
+    for key in sorted({(r["backend"], r["workers"]) for r in results}, key=str):
+        rs = sorted((r for r in results if (r["backend"], r["workers"]) == key), key=lambda r: r["n"])
+        label = key[0] if key[1] is None else f"{key[0]} ×{key[1]}"
+        ax_err.loglog([r["n"] for r in rs], [r["rmse"] for r in rs], marker="o", label=label)
+        ax_time.loglog([r["n"] for r in rs], [r["seconds"] for r in rs], marker="o", label=label)
+    ns = sorted({r["n"] for r in results})
+    ref = results[0]["rmse"] * (results[0]["n"] ** 0.5)
+    ax_err.loglog(ns, [ref / n ** 0.5 for n in ns], "k--", linewidth=1, label="~1/√N")
+    ax_err.set(xlabel="N", ylabel="RMSE", title="Похибка vs N")
+    ax_time.set(xlabel="N", ylabel="секунди", title="Час vs N")
+    ax_err.legend()
+    ax_time.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--decades", nargs=2, type=int, default=[3, 7], metavar=("LO", "HI"),
+                   help="N = 10^LO .. 10^HI")
+    p.add_argument("--backends", nargs="+", default=["python", "numpy", "parallel"])
+    p.add_argument("--workers", nargs="+", type=int, default=[2, 4])
+    p.add_argument("--max-python-n", type=int, default=10**6)
+    p.add_argument("--seed", type=int, default=123)
+    p.add_argument("--json")
+    p.add_argument("--csv")
+    p.add_argument("--plot")
+    p.add_argument("--baseline", help="JSON попереднього прогону для пошуку регресій")
+    p.add_argument("--tolerance", type=float, default=0.2,
+                   help="допустиме падіння rolls/s відносно baseline (частка)")
+    args = p.parse_args(argv)
+
+    ns = [10**k for k in range(args.decades[0], args.decades[1] + 1)]
+    results = run_suite(ns, args.backends, args.workers, args.max_python_n, args.seed)
+    if not results:
+        return 0
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.plot:
+        plot(results, args.plot)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for r, b in regressions:
+            print(f"РЕГРЕСІЯ {_key(r)}: {r['rolls_per_sec']:,.0f} < {b['rolls_per_sec']:,.0f} rolls/s")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,182 @@
+import bisect
+import heapq
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+from collections import deque
+from contextlib import nullcontext
+from itertools import islice
+
+IO_CHUNK = 1 << 16      # елементів / байтів за одну порцію потокового вводу-виводу
+NODE_BYTES = 100        # орієнтовна ціна одного вузла з int у пам'яті (для memory_limit)
+SEQ_GAP = 1 << 32       # крок порядкових ключів індексованого списку
+
+
 class Node:
+    __slots__ = ("data", "next")
+
     def __init__(self, data=None):
         self.data = data
         self.next = None
 
 
 class LinkedList:
-    def __init__(self):
+    def __init__(self, indexed: bool = False):
+        """
+        indexed=True вмикає хеш-індекс (значення -> вузли у порядку списку) і мапу
+        попередників, тож search_element і delete_node працюють за O(1) у середньому.
+        Кожен вузол має ще порядковий ключ (кроком SEQ_GAP), тож insert_after ставить
+        дублікат у кошик бінарним пошуком, без проходу по списку; коли між сусідами
+        закінчується місце, ключі перенумеровуються локально (O(log n) амортизовано).
+        Значення мають бути хешованими.
+        """
         self.head = None
+        self.tail = None
+        self._size = 0
+        self._index: dict | None = {} if indexed else None
+        self._prev: dict | None = {} if indexed else None
+        self._seq: dict | None = {} if indexed else None
+
+    @classmethod
+    def from_iterable(cls, iterable, indexed: bool = False) -> "LinkedList":
+        ll = cls(indexed)
+        ll.extend(iterable)
+        return ll
+
+    @classmethod
+    def from_text_file(cls, source, chunk_bytes: int = IO_CHUNK, indexed: bool = False) -> "LinkedList":
+        """Будує список з цілих чисел, розділених пробілами/рядками, читаючи файл порціями."""
+        return cls.from_iterable(iter_text_ints(source, chunk_bytes), indexed)
+
+    @classmethod
+    def from_binary(cls, source, typecode: str = "q", indexed: bool = False) -> "LinkedList":
+        """Будує список з упакованих чисел (формат array/struct typecode): файл через mmap або буфер."""
+        return cls.from_iterable(iter_binary_ints(source, typecode), indexed)
+
+    def write_text(self, target, sep: str = "\n", chunk_size: int = IO_CHUNK, end: str = "\n"):
+        """Пише значення текстом порціями по chunk_size — без одного великого рядка."""
+        with _open_target(target, "w") as f:
+            first = True
+            for chunk in self._chunks(chunk_size):
+                if not first:
+                    f.write(sep)
+                f.write(sep.join(map(str, chunk)))
+                first = False
+            f.write(end)
+
+    def write_binary(self, target, typecode: str = "q", chunk_size: int = IO_CHUNK):
+        """Пише значення в упакованому двійковому форматі (array typecode) порціями."""
+        with _open_target(target, "wb") as f:
+            for chunk in self._chunks(chunk_size):
+                f.write(array(typecode, chunk).tobytes())
+
+    def _chunks(self, size: int):
+        chunk = []
+        cur = self.head
+        while cur:
+            chunk.append(cur.data)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+            cur = cur.next
+        if chunk:
+            yield chunk
+
+    @property
+    def indexed(self) -> bool:
+        return self._index is not None
+
+    def __len__(self):
+        return self._size
+
+    def extend(self, iterable):
+        """Додає всі елементи в кінець за O(k) — без проходу по вже наявних вузлах."""
+        dummy = Node()
+        tail = dummy
+        count = 0
+        for data in iterable:
+            tail.next = Node(data)
+            tail = tail.next
+            count += 1
+        if count == 0:
+            return self
+        first = dummy.next
+        if self._index is not None:
+            prev = self.tail
+            cur = first
+            while cur:
+                self._register(cur, prev)
+                prev = cur
+                cur = cur.next
+        if self.head is None:
+            self.head = first
+        else:
+            self.tail.next = first
+        self.tail = tail
+        self._size += count
+        return self
 
     def insert_at_beginning(self, data):
         new_node = Node(data)
         new_node.next = self.head
+        if self._index is not None:
+            self._index.setdefault(data, deque()).appendleft(new_node)
+            self._prev[new_node] = None
+            self._seq[new_node] = self._seq[self.head] - SEQ_GAP if self.head else 0
+            if self.head:
+                self._prev[self.head] = new_node
         self.head = new_node
+        if self.tail is None:
+            self.tail = new_node
+        self._size += 1
 
     def insert_at_end(self, data):
         new_node = Node(data)
+        if self._index is not None:
+            self._register(new_node, self.tail)
         if self.head is None:
             self.head = new_node
         else:
-            cur = self.head
-            while cur.next:
-                cur = cur.next
-            cur.next = new_node
+            self.tail.next = new_node
+        self.tail = new_node
+        self._size += 1
 
     def insert_after(self, prev_node: Node, data):
         if prev_node is None:
             print("Попереднього вузла не існує.")
             return
         new_node = Node(data)
-        new_node.next = prev_node.next
+        succ = prev_node.next
+        if self._index is not None:
+            # ключ — між сусідами; якщо місця немає, спершу розсуваємо сусідні ключі
+            if succ is not None and self._seq[succ] - self._seq[prev_node] < 2:
+                self._make_room(prev_node)
+            lo = self._seq[prev_node]
+            hi = self._seq[succ] if succ is not None else lo + 2 * SEQ_GAP
+            self._seq[new_node] = (lo + hi) // 2
+            self._prev[new_node] = prev_node
+            if succ is not None:
+                self._prev[succ] = new_node
+            # кошик упорядкований за ключами — місце дубліката шукаємо бінарно
+            bisect.insort(self._index.setdefault(data, deque()), new_node, key=self._seq.__getitem__)
+        new_node.next = succ
         prev_node.next = new_node
+        if prev_node is self.tail:
+            self.tail = new_node
+        self._size += 1
 
     def delete_node(self, key: int):
+        if self._index is not None:
+            self._delete_indexed(key)
+            return
         cur = self.head
         if cur and cur.data == key:
             self.head = cur.next
+            if self.head is None:
+                self.tail = None
+            self._size -= 1
             cur = None
             return
         prev = None
@@ -44,9 +186,15 @@ class LinkedList:
         if cur is None:
             return
         prev.next = cur.next
+        if cur is self.tail:
+            self.tail = prev
+        self._size -= 1
         cur = None
 
     def search_element(self, data: int) -> Node | None:
+        if self._index is not None:
+            bucket = self._index.get(data)
+            return bucket[0] if bucket else None
         cur = self.head
         while cur:
             if cur.data == data:
@@ -55,12 +203,7 @@ class LinkedList:
         return None
 
     def print_list(self):
-        parts = []
-        current = self.head
-        while current:
-            parts.append(str(current.data))
-            current = current.next
-        print(" --> ".join(parts))
+        self.write_text(sys.stdout, sep=" --> ")
 
     def __iter__(self):
         cur = self.head
@@ -75,29 +218,180 @@ class LinkedList:
         reverse_linked_list(self)
         return self
 
-    def sort(self):
-        sort_linked_list(self)
+    def sort(self, method: str = "natural"):
+        sort_linked_list(self, method)
         return self
 
     @staticmethod
     def merge_two(l1: "LinkedList", l2: "LinkedList") -> "LinkedList":
         return merge_sorted_linked_lists(l1, l2)
 
+    @staticmethod
+    def merge_many(lists) -> "LinkedList":
+        return merge_many_sorted_linked_lists(lists)
+
+    def _set_chain(self, head: Node | None, tail: Node | None = None, size: int | None = None):
+        """Встановлює новий ланцюжок вузлів; хвіст і довжину дораховує, якщо їх не передано."""
+        self.head = head
+        if tail is None or size is None:
+            tail, size = None, 0
+            cur = head
+            while cur:
+                tail = cur
+                size += 1
+                cur = cur.next
+        self.tail = tail
+        self._size = size
+        if self._index is not None:
+            self._reindex()
+
+    def _clear(self):
+        """Відпускає вузли, що перейшли в інший список: сам список стає порожнім."""
+        self.head = self.tail = None
+        self._size = 0
+        if self._index is not None:
+            self._index = {}
+            self._prev = {}
+            self._seq = {}
+
+    def _register(self, node: Node, prev: Node | None):
+        """Додає вузол у кінець його кошика індексу (порядок кошика = порядок у списку)."""
+        self._index.setdefault(node.data, deque()).append(node)
+        self._prev[node] = prev
+        self._seq[node] = self._seq[prev] + SEQ_GAP if prev is not None else 0
+
+    def _make_room(self, node: Node):
+        """
+        Order maintenance (Bender et al.): шукаємо найменший вирівняний блок ключів
+        розміру 2^i навколо node, де вузлів (разом з новим) ≤ (4/3)^i, і рівномірно
+        розставляємо їх у блоці — крок ≥ 1.5^i ≥ 2. Порядок кошиків не змінюється.
+        """
+        seq = self._seq
+        key = seq[node]
+        first = last = node
+        count = 1
+        i = 1
+        while True:
+            i += 1
+            lo = (key >> i) << i
+            hi = lo + (1 << i)
+            p = self._prev[first]
+            while p is not None and seq[p] >= lo:
+                first, count = p, count + 1
+                p = self._prev[p]
+            nxt = last.next
+            while nxt is not None and seq[nxt] < hi:
+                last, count = nxt, count + 1
+                nxt = nxt.next
+            if (count + 1) * 3 ** i <= 4 ** i:
+                break
+        step = (1 << i) // count
+        cur = first
+        for j in range(count):
+            seq[cur] = lo + j * step
+            cur = cur.next
+
+    def _reindex(self):
+        """Перебудовує індекс за O(n) — після операцій, що переставляють вузли."""
+        self._index = {}
+        self._prev = {}
+        self._seq = {}
+        prev = None
+        cur = self.head
+        while cur:
+            self._register(cur, prev)
+            prev = cur
+            cur = cur.next
+
+    def _delete_indexed(self, key):
+        """Видаляє перше входження key за O(1) у середньому через індекс і мапу попередників."""
+        bucket = self._index.get(key)
+        if not bucket:
+            return
+        node = bucket.popleft()
+        if not bucket:
+            del self._index[key]
+        pred = self._prev.pop(node)
+        del self._seq[node]
+        succ = node.next
+        if pred is None:
+            self.head = succ
+        else:
+            pred.next = succ
+        if succ is not None:
+            self._prev[succ] = pred
+        if node is self.tail:
+            self.tail = pred
+        node.next = None
+        self._size -= 1
+
+
+def _open_target(target, mode: str):
+    """Шлях відкриваємо самі (і закриваємо), файловий об'єкт використовуємо як є."""
+    if isinstance(target, (str, os.PathLike)):
+        return open(target, mode)
+    return nullcontext(target)
+
+
+def iter_text_ints(source, chunk_bytes: int = IO_CHUNK):
+    """Лінивий потік цілих чисел з тексту; файл читається блоками по chunk_bytes."""
+    with _open_target(source, "r") as f:
+        tail = ""
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            block = tail + block
+            tokens = block.split()
+            # останній токен міг обірватися на межі блоку — відкладаємо його
+            tail = tokens.pop() if tokens and not block[-1].isspace() else ""
+            yield from map(int, tokens)
+        if tail:
+            yield int(tail)
+
+
+def iter_binary_ints(source, typecode: str = "q", batch: int = IO_CHUNK):
+    """
+    Лінивий потік чисел з упакованого буфера. Шлях відображається через mmap,
+    тож у пам'яті одночасно лише одна порція з batch елементів.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm).cast("B").cast(typecode)
+                try:
+                    for i in range(0, len(view), batch):
+                        yield from view[i:i + batch].tolist()
+                finally:
+                    view.release()
+        return
+    view = memoryview(source).cast("B").cast(typecode)
+    for i in range(0, len(view), batch):
+        yield from view[i:i + batch].tolist()
+
 
 def reverse_linked_list(linked_list: LinkedList) -> LinkedList:
     prev = None
     current = linked_list.head
+    linked_list.tail = current
     while current:
         next_node = current.next
         current.next = prev
         prev = current
         current = next_node
     linked_list.head = prev
+    if linked_list.indexed:
+        linked_list._reindex()
     return linked_list
 
 
 def merge_sorted_linked_lists(list1: LinkedList, list2: LinkedList) -> LinkedList:
-    """Стабільне ін-плейс злиття двох відсортованих списків без копіювання вузлів."""
+    """
+    Стабільне ін-плейс злиття двох відсортованих списків без копіювання вузлів.
+    Вузли переходять у новий список, тож list1 і list2 після злиття порожні.
+    """
     a, b = list1.head, list2.head
     dummy = Node()
     tail = dummy
@@ -107,17 +401,178 @@ def merge_sorted_linked_lists(list1: LinkedList, list2: LinkedList) -> LinkedLis
         else:
             tail.next, b = b, b.next
         tail = tail.next
-    tail.next = a or b
+    if a or b:
+        tail.next = a or b
+        tail = list1.tail if a else list2.tail
+
+    merged = LinkedList(list1.indexed or list2.indexed)
+    merged._set_chain(dummy.next, tail if tail is not dummy else None, len(list1) + len(list2))
+    list1._clear()              # вузли тепер належать merged
+    list2._clear()
+    return merged
+
+
+class _HeapEntry:
+    """Голова списку в купі; порівнюється лише через <=, як і merge_sorted_linked_lists."""
+    __slots__ = ("node", "index")
+
+    def __init__(self, node: Node, index: int):
+        self.node = node
+        self.index = index
+
+    def __lt__(self, other: "_HeapEntry") -> bool:
+        if self.index < other.index:                    # рівні — з раніше переданого списку
+            return self.node.data <= other.node.data
+        return not (other.node.data <= self.node.data)
+
+
+def merge_many_sorted_linked_lists(lists) -> LinkedList:
+    """
+    Стабільне k-стороннє злиття відсортованих списків за O(n log k) на купі голів.
+    Вузли перепідв'язуються без копіювання; рівні значення йдуть у порядку списків на вході.
+    Вхідні списки після злиття порожні.
+    """
+    lists = list(lists)
+    heap = [_HeapEntry(ll.head, i) for i, ll in enumerate(lists) if ll.head]
+    heapq.heapify(heap)
+    dummy = Node()
+    tail = dummy
+    while heap:
+        entry = heap[0]
+        node = entry.node
+        tail.next = node
+        tail = node
+        if node.next:
+            entry.node = node.next
+            heapq.heapreplace(heap, entry)
+        else:
+            heapq.heappop(heap)
 
-    merged = LinkedList()
-    merged.head = dummy.next
+    merged = LinkedList(any(ll.indexed for ll in lists))
+    merged._set_chain(dummy.next, tail if tail is not dummy else None, sum(len(ll) for ll in lists))
+    for ll in lists:            # вузли тепер належать merged
+        ll._clear()
     return merged
 
 
-def sort_linked_list(linked_list: LinkedList) -> LinkedList:
-    """Стабільний merge sort для однозв'язного списку (O(n log n), стек O(log n))."""
+def iter_merge_sorted(iterables):
+    """
+    Потокове стабільне k-стороннє злиття відсортованих послідовностей.
+    Порівнює через ту саму _HeapEntry, що й merge_many_sorted_linked_lists.
+    """
+    iterators = [iter(it) for it in iterables]
+    heap = []
+    for i, it in enumerate(iterators):
+        for value in it:
+            heap.append(_HeapEntry(Node(value), i))
+            break
+    heapq.heapify(heap)
+    while heap:
+        entry = heap[0]
+        yield entry.node.data
+        for value in iterators[entry.index]:
+            entry.node = Node(value)
+            heapq.heapreplace(heap, entry)
+            break
+        else:
+            heapq.heappop(heap)
+
+
+def _merge_runs(a: tuple[Node, Node, int], b: tuple[Node, Node, int]) -> tuple[Node, Node, int]:
+    """Стабільно зливає дві серії (голова, хвіст, довжина); повертає таку ж трійку."""
+    left, right = a[0], b[0]
+    dummy = Node()
+    tail = dummy
+    while left and right:
+        if left.data <= right.data:     # стабільність: рівні беремо зліва
+            tail.next = left
+            left = left.next
+        else:
+            tail.next = right
+            right = right.next
+        tail = tail.next
+    size = a[2] + b[2]
+    if left:
+        tail.next = left
+        return dummy.next, a[1], size
+    tail.next = right
+    return dummy.next, b[1] if right else tail, size
+
+
+def _natural_runs(head: Node):
+    """
+    Лениво розрізає список на природні серії: неспадні лишаються як є, строго спадні
+    розвертаються (строгість гарантує стабільність). Дає (голова, хвіст, довжина).
+    """
+    cur = head
+    while cur:
+        start = cur
+        size = 1
+        nxt = cur.next
+        if nxt and nxt.data < cur.data:
+            # строго спадна серія: розвертаємо на місці
+            prev = None
+            while True:
+                nxt = cur.next
+                cur.next = prev
+                prev = cur
+                if nxt is None or not (nxt.data < cur.data):
+                    break
+                cur = nxt
+                size += 1
+            yield prev, start, size
+            cur = nxt
+        else:
+            while nxt and nxt.data >= cur.data:
+                cur = nxt
+                nxt = cur.next
+                size += 1
+            cur.next = None
+            yield start, cur, size
+            cur = nxt
+
+
+def _collapse_runs(stack: list, force: bool = False):
+    """
+    Правила стеку серій з timsort (з виправленням 2015 р.): довжини згори вниз
+    ростуть не повільніше за числа Фібоначчі, тож у стеку O(log n) серій,
+    а зливаються лише сусідні серії близької довжини.
+    """
+    while len(stack) > 1:
+        n = len(stack) - 2
+        if force:
+            if n > 0 and stack[n - 1][2] < stack[n + 1][2]:
+                n -= 1
+        elif ((n > 0 and stack[n - 1][2] <= stack[n][2] + stack[n + 1][2]) or
+              (n > 1 and stack[n - 2][2] <= stack[n - 1][2] + stack[n][2])):
+            if stack[n - 1][2] < stack[n + 1][2]:
+                n -= 1
+        elif stack[n][2] > stack[n + 1][2]:
+            break
+        stack[n:n + 2] = [_merge_runs(stack[n], stack[n + 1])]
+
+
+def sort_linked_list(linked_list: LinkedList, method: str = "natural") -> LinkedList:
+    """
+    Стабільний merge sort для однозв'язного списку (O(n log n)).
+    method="natural" — без рекурсії: природні серії знімаються по одній і зливаються
+    через стек серій, як у timsort (O(log n) додаткової пам'яті); майже відсортований
+    вхід — близько O(n).
+    method="top_down" — класичний рекурсивний варіант (стек O(log n)).
+    """
     if linked_list.head is None or linked_list.head.next is None:
         return linked_list
+    if method == "natural":
+        stack = []
+        for run in _natural_runs(linked_list.head):
+            stack.append(run)
+            _collapse_runs(stack)
+        _collapse_runs(stack, force=True)
+        head, tail, size = stack[0]
+        linked_list._set_chain(head, tail, size)
+        return linked_list
+    if method != "top_down":
+        raise ValueError(f"Невідомий метод сортування: {method!r}")
 
     def split(head: Node) -> Node:
         slow = head
@@ -151,10 +606,98 @@ def sort_linked_list(linked_list: LinkedList) -> LinkedList:
         right = merge_sort(middle)
         return merge(left, right)
 
-    linked_list.head = merge_sort(linked_list.head)
+    linked_list._set_chain(merge_sort(linked_list.head))
     return linked_list
 
 
+def external_sort_iter(source, run_size: int = 1_000_000, fan_in: int = 64,
+                       memory_limit: int | None = None, tmp_dir=None, typecode: str = "q"):
+    """
+    Зовнішнє (out-of-core) стабільне сортування потоку цілих чисел.
+    1) Вхід читається порціями по run_size елементів (або memory_limit // NODE_BYTES),
+       кожна порція сортується sort_linked_list і скидається у тимчасовий двійковий файл.
+    2) Серії зливаються потоково по fan_in за прохід, доки їх не стане ≤ fan_in;
+       останнє злиття віддається ліниво. Тимчасові файли видаляються після вичерпання
+       або закриття генератора.
+    """
+    if memory_limit is not None:
+        run_size = max(1, memory_limit // NODE_BYTES)
+    if run_size <= 0 or fan_in < 2:
+        raise ValueError("run_size має бути > 0, а fan_in ≥ 2")
+    runs = []
+
+    def new_run_path():
+        fd, path = tempfile.mkstemp(suffix=".run", dir=tmp_dir)
+        os.close(fd)
+        runs.append(path)
+        return path
+
+    try:
+        it = iter(source)
+        while True:
+            chunk = LinkedList.from_iterable(islice(it, run_size))
+            if chunk.head is None:
+                break
+            sort_linked_list(chunk)
+            chunk.write_binary(new_run_path(), typecode)
+            del chunk
+
+        pending = list(runs)
+        while len(pending) > fan_in:
+            # прохід злиття: сусідні групи по fan_in, порядок серій зберігається (стабільність)
+            merged = []
+            for i in range(0, len(pending), fan_in):
+                group = pending[i:i + fan_in]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                path = new_run_path()
+                with open(path, "wb") as f:
+                    buf = array(typecode)
+                    for value in iter_merge_sorted(iter_binary_ints(p, typecode) for p in group):
+                        buf.append(value)
+                        if len(buf) >= IO_CHUNK:
+                            f.write(buf.tobytes())
+                            del buf[:]
+                    f.write(buf.tobytes())
+                for p in group:
+                    os.remove(p)
+                    runs.remove(p)
+                merged.append(path)
+            pending = merged
+
+        yield from iter_merge_sorted(iter_binary_ints(p, typecode) for p in pending)
+    finally:
+        for p in runs:
+            if os.path.exists(p):
+                os.remove(p)
+
+
+def external_sort(source, output, fmt: str = "binary", **options) -> int:
+    """
+    Сортує source (ітерований потік чисел) через external_sort_iter і пише результат
+    у output (шлях або файл) у форматі fmt="binary" | "text". Повертає кількість елементів.
+    """
+    if fmt not in ("binary", "text"):
+        raise ValueError(f"Невідомий формат: {fmt!r}")
+    typecode = options.get("typecode", "q")
+    count = 0
+    with _open_target(output, "wb" if fmt == "binary" else "w") as f:
+        chunk = []
+        for value in external_sort_iter(source, **options):
+            chunk.append(value)
+            if len(chunk) == IO_CHUNK:
+                f.write(array(typecode, chunk).tobytes() if fmt == "binary"
+                        else "\n".join(map(str, chunk)) + "\n")
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            f.write(array(typecode, chunk).tobytes() if fmt == "binary"
+                    else "\n".join(map(str, chunk)) + "\n")
+            count += len(chunk)
+    return count
+
+
 def main():
     # 1) Створюємо однозв'язний список l1
     l1 = LinkedList()
@@ -193,6 +736,14 @@ def main():
     print("\n6) Злитий відсортований список (l1 + l2):")
     merged.print_list()
     assert merged.to_list() == [5, 10, 15, 20, 25, 30, 35, 40]
+    assert len(l1) == len(l2) == 0 and l1.head is None
+
+    # 7) K-стороннє злиття кількох відсортованих списків
+    shards = [LinkedList.from_iterable(xs) for xs in ([1, 7, 9], [2, 3], [], [4, 8])]
+    merged_many = LinkedList.merge_many(shards)
+    print("\n7) Злиття кількох списків:")
+    merged_many.print_list()
+    assert merged_many.to_list() == [1, 2, 3, 4, 7, 8, 9]
 
     print("\n Усі перевірки пройдено.")
 
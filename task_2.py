@@ -1,6 +1,9 @@
 import turtle
 import math
 import cmath
+import sys
+
+import numpy as np
 
 # --- Налаштування графіка ---
 LINE_COLOR = "#8B2E2E"   # колір ліній (hex)
@@ -9,29 +12,150 @@ ANGLE_DEG  = 45.0        # кут розгалуження
 SIZE       = 200.0       # довжина стовбура
 PEN_WIDTH  = 2           # товщина ліній
 
-def _branch(t, order: int, start: complex, length: float, theta_rad: float, angle_rad: float):
+def _rotations(angle_deg: float) -> np.ndarray:
+    """Множники [ліва, права] гілка: поворот на ±a разом зі зменшенням на cos(a) / sin(a)."""
+    angle_rad = math.radians(angle_deg)
+    return np.array([math.cos(angle_rad) * cmath.exp(1j * angle_rad),
+                     math.sin(angle_rad) * cmath.exp(-1j * angle_rad)])
+
+def pythagoras_segments(order: int, start: complex = 0j, size: float = SIZE,
+                        angle_deg: float = ANGLE_DEG, theta_rad: float = math.pi / 2) -> np.ndarray:
     """
-    Малює одну гілку довжини length від точки start під кутом theta_rad,
-    а потім рекурсивно дві гілки від її вершини: +angle та -angle.
+    Геометрія дерева без рекурсії: рівень за рівнем у комплексних масивах NumPy.
+    Кожна гілка (вектор vec) породжує дві: vec·cos(a)·e^{+ia} (вліво) і vec·sin(a)·e^{-ia} (вправо).
+    Повертає суцільний масив форми (2^(order+1) − 1, 2) complex128: рядок = (початок, кінець)
+    сегмента; рівні йдуть підряд, починаючи зі стовбура.
     """
-
-    vec = cmath.rect(length, theta_rad)  
-    end = start + vec
-
-    # сегмент
-    t.penup(); t.goto(start.real, start.imag); t.pendown()
-    t.goto(end.real, end.imag)
-
-    if order == 0:
-        return
-
-    # довжини дочірніх гілок
-    l_left  = length * math.cos(angle_rad)
-    l_right = length * math.sin(angle_rad)
-
-    # рекурсія: вліво і вправо
-    _branch(t, order - 1, end, l_left,  theta_rad + angle_rad, angle_rad)
-    _branch(t, order - 1, end, l_right, theta_rad - angle_rad, angle_rad)
+    if order < 0:
+        raise ValueError("Рівень рекурсії має бути цілим числом ≥ 0.")
+    rot = _rotations(angle_deg)
+    segments = np.empty(((1 << (order + 1)) - 1, 2), dtype=np.complex128)
+    starts = np.array([start], dtype=np.complex128)
+    vecs = np.array([cmath.rect(size, theta_rad)])
+    offset = 0
+    for level in range(order + 1):
+        ends = starts + vecs
+        segments[offset:offset + len(starts), 0] = starts
+        segments[offset:offset + len(starts), 1] = ends
+        offset += len(starts)
+        if level < order:
+            starts = np.repeat(ends, 2)                  # у кожного кінця — дві дочірні гілки
+            vecs = (vecs[:, None] * rot).ravel()         # [ліва, права] для кожної гілки
+    return segments
+
+def iter_pythagoras_segments(order: int, start: complex = 0j, size: float = SIZE,
+                             angle_deg: float = ANGLE_DEG, theta_rad: float = math.pi / 2,
+                             chunk_size: int = 1 << 16):
+    """
+    Ті самі сегменти, що й pythagoras_segments, але порціями ≤ chunk_size рядків.
+    Явний стек блоків (глибина ≤ order) тримає в пам'яті O(order · chunk_size)
+    елементів — навіть коли сегментів десятки мільйонів.
+    """
+    if order < 0:
+        raise ValueError("Рівень рекурсії має бути цілим числом ≥ 0.")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size має бути > 0")
+    rot = _rotations(angle_deg)
+    stack = [(0, np.array([start], dtype=np.complex128), np.array([cmath.rect(size, theta_rad)]))]
+    while stack:
+        level, starts, vecs = stack.pop()
+        ends = starts + vecs
+        yield np.stack([starts, ends], axis=1)
+        if level < order:
+            child_starts = np.repeat(ends, 2)
+            child_vecs = (vecs[:, None] * rot).ravel()
+            for i in reversed(range(0, len(child_starts), chunk_size)):
+                stack.append((level + 1, child_starts[i:i + chunk_size], child_vecs[i:i + chunk_size]))
+
+def export_pythagoras_tree(order: int, path: str, width: int = 800, height: int = 800,
+                           chunk_size: int = 1 << 16):
+    """
+    Безголовий експорт без turtle і дисплея: формат — за розширенням path.
+    .svg і .pdf пишуться потоково порціями сегментів; інше (.png, .jpg, ...) —
+    растр через Pillow у полотні фіксованого розміру. Пам'ять не залежить від order.
+    Координати й налаштування — як у draw_pythagoras_tree (LINE_COLOR, BG_COLOR,
+    ANGLE_DEG, SIZE, PEN_WIDTH; стовбур стартує за 20 пікселів від низу).
+    """
+    start = complex(0.0, -height / 2 + 20)
+    chunks = iter_pythagoras_segments(order, start, SIZE, ANGLE_DEG, chunk_size=chunk_size)
+    ext = path.rsplit(".", 1)[-1].lower()
+    if ext == "svg":
+        _export_svg(chunks, path, width, height)
+    elif ext == "pdf":
+        _export_pdf(chunks, path, width, height)
+    else:
+        _export_raster(chunks, path, width, height)
+
+def _xy(chunk) -> np.ndarray:
+    """Порція complex (k, 2) -> float (k, 4): x0, y0, x1, y1 у координатах turtle."""
+    return np.ascontiguousarray(chunk).view(np.float64).reshape(-1, 4)
+
+def _export_raster(chunks, path, width, height):
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (width, height), BG_COLOR)
+    draw = ImageDraw.Draw(image)
+    for chunk in chunks:
+        xy = _xy(chunk)
+        xy[:, 0::2] += width / 2            # вісь y у растрі дивиться вниз
+        xy[:, 1::2] = height / 2 - xy[:, 1::2]
+        for line in xy.tolist():
+            draw.line(line, fill=LINE_COLOR, width=PEN_WIDTH)
+    image.save(path)
+
+def _export_svg(chunks, path, width, height):
+    with open(path, "w") as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                f'viewBox="0 0 {width} {height}">\n'
+                f'<rect width="100%" height="100%" fill="{BG_COLOR}"/>\n'
+                f'<g stroke="{LINE_COLOR}" stroke-width="{PEN_WIDTH}" stroke-linecap="round" fill="none">\n')
+        for chunk in chunks:
+            xy = _xy(chunk)
+            xy[:, 0::2] += width / 2
+            xy[:, 1::2] = height / 2 - xy[:, 1::2]
+            f.write('<path d="')
+            f.write(" ".join("M%.2f %.2fL%.2f %.2f" % tuple(row) for row in xy.tolist()))
+            f.write('"/>\n')
+        f.write("</g>\n</svg>\n")
+
+def _export_pdf(chunks, path, width, height):
+    """Мінімальний одно-сторінковий PDF: потік контенту пишеться порціями, довжина — окремим об'єктом."""
+    from PIL import ImageColor
+
+    def rgb(color):
+        return " ".join(f"{c / 255:.3f}" for c in ImageColor.getrgb(color)[:3])
+
+    with open(path, "wb") as f:
+        offsets = []
+
+        def obj(body: bytes):
+            offsets.append(f.tell())
+            f.write(f"{len(offsets)} 0 obj\n".encode() + body + b"\nendobj\n")
+
+        f.write(b"%PDF-1.4\n")
+        obj(b"<< /Type /Catalog /Pages 2 0 R >>")
+        obj(b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>")
+        obj(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] "
+            f"/Contents 4 0 R /Resources << >> >>".encode())
+        offsets.append(f.tell())
+        f.write(b"4 0 obj\n<< /Length 5 0 R >>\nstream\n")
+        stream_start = f.tell()
+        f.write(f"{rgb(BG_COLOR)} rg 0 0 {width} {height} re f\n"
+                f"{rgb(LINE_COLOR)} RG {PEN_WIDTH} w 1 J\n".encode())
+        for chunk in chunks:
+            xy = _xy(chunk)
+            xy[:, 0::2] += width / 2            # у PDF вісь y дивиться вгору, як у turtle
+            xy[:, 1::2] += height / 2
+            f.write("".join("%.2f %.2f m %.2f %.2f l\n" % tuple(row) for row in xy.tolist()).encode())
+            f.write(b"S\n")
+        length = f.tell() - stream_start
+        f.write(b"endstream\nendobj\n")
+        obj(str(length).encode())
+        xref = f.tell()
+        f.write(f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode())
+        for off in offsets:
+            f.write(f"{off:010d} 00000 n \n".encode())
+        f.write(f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
 
 def draw_pythagoras_tree(order: int):
     if order < 0:
@@ -49,16 +173,21 @@ def draw_pythagoras_tree(order: int):
     turtle.tracer(0, 0)
 
     y0 = -screen.window_height() / 2 + 20
-    start = complex(0.0, y0)
-    theta0 = math.pi / 2                # 90 градусів вгору
-    angle_rad = math.radians(ANGLE_DEG)
+    segments = pythagoras_segments(order, complex(0.0, y0))
 
-    _branch(t, order, start, SIZE, theta0, angle_rad)
+    # черепаха лише відмальовує готовий масив сегментів
+    for x0, y0_, x1, y1 in segments.view(np.float64).reshape(-1, 4).tolist():
+        t.penup(); t.goto(x0, y0_); t.pendown()
+        t.goto(x1, y1)
 
     turtle.update()
     turtle.done()
 
 def main():
+    # python task_2.py <order> <файл.png|svg|pdf> — безголовий експорт замість вікна turtle
+    if len(sys.argv) == 3:
+        export_pythagoras_tree(int(sys.argv[1]), sys.argv[2])
+        return
     try:
         order = int(input("Вкажіть рівень рекурсії (ціле число ≥ 0): ").strip())
         if order < 0:
@@ -1,9 +1,352 @@
+import hashlib
 import heapq
+import os
+import sys
+from collections import OrderedDict
+from multiprocessing import Pool, shared_memory
+from types import SimpleNamespace
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
 
+# -------- Стиснений граф (CSR) --------
+class CSRGraph:
+    """
+    Граф, «скомпільований» у CSR-масиви: вузли -> цілі 0..n-1, сусіди u лежать у
+    targets[offsets[u]:offsets[u+1]] з вагами weights[...] (NumPy, без dict-of-dicts).
+    Якщо мітки вузлів порівнювані, ідентифікатори видаються у відсортованому порядку —
+    тоді нічиї в купі розв'язуються так само, як у dijkstra на networkx-графі.
+    """
+
+    def __init__(self, nodes, offsets, targets, weights, directed: bool = False):
+        self.nodes = list(nodes)
+        self.index = {v: i for i, v in enumerate(self.nodes)}
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        self.targets = np.ascontiguousarray(targets, dtype=np.int64)
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.directed = directed
+
+    @staticmethod
+    def _ordered(nodes):
+        nodes = list(nodes)
+        try:
+            return sorted(nodes)
+        except TypeError:
+            return nodes
+
+    @classmethod
+    def from_networkx(cls, G, weight: str = "weight", default: float = 1.0) -> "CSRGraph":
+        """Компілює networkx-граф один раз; порядок сусідів — як у G[u]."""
+        nodes = cls._ordered(G)
+        index = {v: i for i, v in enumerate(nodes)}
+        offsets = np.zeros(len(nodes) + 1, dtype=np.int64)
+        targets, weights = [], []
+        for i, u in enumerate(nodes):
+            for v, data in G[u].items():
+                targets.append(index[v])
+                weights.append(data.get(weight, default))
+            offsets[i + 1] = len(targets)
+        return cls(nodes, offsets, targets, weights, G.is_directed())
+
+    @classmethod
+    def from_edges(cls, edges, directed: bool = False, nodes=None) -> "CSRGraph":
+        """Компілює список ребер (u, v, w) векторно; неорієнтовані ребра додаються в обидва боки."""
+        edges = list(edges)
+        if nodes is None:
+            nodes = cls._ordered({x for u, v, _ in edges for x in (u, v)})
+        index = {v: i for i, v in enumerate(nodes)}
+        src = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int64, count=len(edges))
+        dst = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int64, count=len(edges))
+        w = np.fromiter((w for _, _, w in edges), dtype=np.float64, count=len(edges))
+        if not directed:
+            src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+            w = np.concatenate([w, w])
+        order = np.argsort(src, kind="stable")
+        offsets = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(nodes)), out=offsets[1:])
+        return cls(nodes, offsets, dst[order], w[order], directed)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __contains__(self, v):
+        return v in self.index
+
+    def number_of_edges(self) -> int:
+        m = len(self.targets)
+        return m if self.directed else m // 2
+
+    def reversed(self) -> "CSRGraph":
+        """Граф з оберненими ребрами (для орієнтованого — потрібен двобічному пошуку)."""
+        if not self.directed:
+            return self
+        if getattr(self, "_reversed", None) is None:
+            src = np.repeat(np.arange(len(self.nodes), dtype=np.int64), np.diff(self.offsets))
+            order = np.argsort(self.targets, kind="stable")
+            offsets = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.targets, minlength=len(self.nodes)), out=offsets[1:])
+            self._reversed = CSRGraph(self.nodes, offsets, src[order], self.weights[order], True)
+        return self._reversed
+
+
+def _dijkstra_csr(g: CSRGraph, s: int):
+    """Дейкстра на цілих id: повертає списки dist і prev (-1 — немає попередника)."""
+    # memoryview дає швидку індексацію Python-скалярами без копіювання масивів
+    offsets, targets, weights = memoryview(g.offsets), memoryview(g.targets), memoryview(g.weights)
+    n = len(offsets) - 1
+    dist = [float("inf")] * n
+    prev = [-1] * n
+    dist[s] = 0.0
+    pq = [(0.0, s)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d != dist[u]:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            nd = d + weights[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(pq, (nd, v))
+    return dist, prev
+
+
+# -------- Черги з пріоритетом з decrease-key --------
+# Спільний інтерфейс: push(item, prio) — вставка або зменшення ключа, pop() -> (prio, item),
+# bool(q) — чи є елементи. Нічиї розв'язуються за (prio, item), як у heapq-варіанті.
+class IndexedHeap:
+    """Бінарна купа з індексом позицій: справжній decrease-key, без застарілих записів."""
+
+    def __init__(self):
+        self._heap = []        # [(prio, item)]
+        self._pos = {}         # item -> позиція в _heap
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def push(self, item, prio):
+        i = self._pos.get(item)
+        if i is None:
+            self._heap.append((prio, item))
+            i = len(self._heap) - 1
+        elif prio < self._heap[i][0]:
+            self._heap[i] = (prio, item)
+        else:
+            return
+        self._sift_up(i)
+
+    def pop(self):
+        heap = self._heap
+        top = heap[0]
+        last = heap.pop()
+        del self._pos[top[1]]
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return top
+
+    def _sift_up(self, i):
+        heap, pos = self._heap, self._pos
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if entry < heap[parent]:
+                heap[i] = heap[parent]
+                pos[heap[i][1]] = i
+                i = parent
+            else:
+                break
+        heap[i] = entry
+        pos[entry[1]] = i
+
+    def _sift_down(self, i):
+        heap, pos = self._heap, self._pos
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1] < heap[child]:
+                child += 1
+            if heap[child] < entry:
+                heap[i] = heap[child]
+                pos[heap[i][1]] = i
+                i = child
+            else:
+                break
+        heap[i] = entry
+        pos[entry[1]] = i
+
+
+class _PairingNode:
+    __slots__ = ("key", "child", "sibling", "left")
+
+    def __init__(self, key):
+        self.key = key          # (prio, item)
+        self.child = None
+        self.sibling = None
+        self.left = None        # лівий сусід або батько
+
+
+class PairingHeap:
+    """Парувальна купа: O(1) вставка і decrease-key (амортизовано), pop — двопрохідне злиття."""
+
+    def __init__(self):
+        self._root = None
+        self._nodes = {}
+
+    def __bool__(self):
+        return self._root is not None
+
+    @staticmethod
+    def _meld(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b.key < a.key:
+            a, b = b, a
+        b.left = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.left = b
+        a.child = b
+        return a
+
+    def push(self, item, prio):
+        node = self._nodes.get(item)
+        if node is None:
+            node = self._nodes[item] = _PairingNode((prio, item))
+            self._root = self._meld(self._root, node)
+            return
+        if prio >= node.key[0]:
+            return
+        node.key = (prio, item)
+        if node is self._root:
+            return
+        # вирізаємо піддерево вузла і зливаємо з коренем
+        if node.left.child is node:
+            node.left.child = node.sibling
+        else:
+            node.left.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.left = node.left
+        node.left = node.sibling = None
+        self._root = self._meld(self._root, node)
+
+    def pop(self):
+        root = self._root
+        del self._nodes[root.key[1]]
+        pairs = []
+        child = root.child
+        while child is not None:
+            a, b = child, child.sibling
+            child = b.sibling if b is not None else None
+            a.left = a.sibling = None
+            if b is not None:
+                b.left = b.sibling = None
+            pairs.append(self._meld(a, b))
+        merged = None
+        for h in reversed(pairs):
+            merged = self._meld(h, merged)
+        self._root = merged
+        return root.key
+
+
+class DialQueue:
+    """
+    Черга Діала (кільце з max_weight + 1 кошиків) для цілих невід'ємних ваг ≤ max_weight:
+    push і pop за O(1) + прохід курсора. Усередині кошика порядок — LIFO.
+    """
+
+    def __init__(self, max_weight: int):
+        self._buckets = [[] for _ in range(int(max_weight) + 1)]
+        self._prio = {}
+        self._cursor = 0
+
+    def __bool__(self):
+        return bool(self._prio)
+
+    def push(self, item, prio):
+        old = self._prio.get(item)
+        if old is not None and prio >= old:
+            return
+        self._prio[item] = prio
+        self._buckets[int(prio) % len(self._buckets)].append(item)   # старий запис стане застарілим
+
+    def pop(self):
+        buckets = self._buckets
+        while True:
+            bucket = buckets[self._cursor % len(buckets)]
+            while bucket:
+                item = bucket.pop()
+                prio = self._prio.get(item)
+                if prio is not None and int(prio) == self._cursor:
+                    del self._prio[item]
+                    return prio, item
+            self._cursor += 1
+
+
+QUEUES = {"indexed": IndexedHeap, "pairing": PairingHeap, "dial": DialQueue}
+
+
+def _max_int_weight(G) -> int:
+    """Найбільша вага для черги Діала; перевіряє, що всі ваги — цілі невід'ємні."""
+    if isinstance(G, CSRGraph):
+        weights = G.weights
+    else:
+        weights = np.fromiter((d.get("weight", 1.0) for _, _, d in G.edges(data=True)), dtype=np.float64)
+    if weights.size and ((weights < 0).any() or (weights != np.floor(weights)).any()):
+        raise ValueError("Черга Діала потребує цілих невід'ємних ваг")
+    return int(weights.max()) if weights.size else 0
+
+
+def _dijkstra_queue(G, start, queue: str):
+    """Дейкстра з чергою, що підтримує decrease-key, — без застарілих записів."""
+    if queue not in QUEUES:
+        raise ValueError(f"Невідома черга: {queue!r}")
+    succ, key, label = _adjacency(G)
+    q = DialQueue(_max_int_weight(G)) if queue == "dial" else QUEUES[queue]()
+    s = key(start)
+    dist = {s: 0.0}
+    prev = {s: None}
+    q.push(s, 0.0)
+    while q:
+        d, u = q.pop()
+        for v, w in succ(u):
+            nd = d + w
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                prev[v] = u
+                q.push(v, nd)
+    inf = float("inf")
+    dist_out = {v: dist.get(key(v), inf) for v in G}
+    prev_out = {}
+    for v in G:
+        p = prev.get(key(v))
+        prev_out[v] = None if p is None else label(p)
+    return dist_out, prev_out
+
+
 # -------- Дейкстра на бінарній купі --------
-def dijkstra(G, start):
+def dijkstra(G, start, queue: str = "heapq"):
+    """
+    queue: "heapq" — купа з лінивим видаленням (за замовчуванням); "indexed", "pairing" —
+    купи з decrease-key; "dial" — кошики для цілих ваг. Відстані однакові для всіх черг.
+    """
+    if queue != "heapq":
+        return _dijkstra_queue(G, start, queue)
+    if isinstance(G, CSRGraph):
+        dist_ids, prev_ids = _dijkstra_csr(G, G.index[start])
+        nodes = G.nodes
+        dist = dict(zip(nodes, dist_ids))
+        prev = {v: (nodes[p] if p >= 0 else None) for v, p in zip(nodes, prev_ids)}
+        return dist, prev
     dist = {v: float("inf") for v in G}
     prev = {v: None for v in G}
     dist[start] = 0.0
@@ -32,10 +375,475 @@ def get_path(prev, s, t):
     path.reverse()
     return path if path and path[0] == s else []
 
+# -------- Інкрементне оновлення --------
+def dijkstra_update(G, start, dist, prev, changes):
+    """
+    Оновлює дерево найкоротших шляхів (dist, prev) від start після пакета змін ребер
+    changes = [(u, v, w), ...] (w=None — видалити ребро; нове ребро — вставка),
+    не перераховуючи все з нуля. Зміни застосовуються до G; dist і prev оновлюються
+    на місці й повертаються.
+    Підхід як у динамічному SSSP (Ramalingam–Reps): піддерева під ребрами дерева, що
+    подовжились/зникли, скидаються й отримують оцінки від незачеплених сусідів; разом
+    зі здешевленими ребрами це стартові вершини Дейкстри, яка ремонтує лише зачеплене.
+    Відстані збігаються з новим запуском dijkstra; серед рівноцінних шляхів prev може
+    вибрати інший.
+    """
+    directed = G.is_directed()
+    grown, shrunk = [], []
+    for u, v, w in changes:
+        old = G[u][v].get("weight", 1.0) if G.has_edge(u, v) else None
+        if w is None:
+            if old is not None:
+                G.remove_edge(u, v)
+        else:
+            G.add_edge(u, v, weight=w)
+        for x in (u, v):
+            if x in G and x not in dist:            # нова вершина, що справді з'явилась у G
+                dist[x], prev[x] = float("inf"), None
+        if old is not None and (w is None or w > old):
+            grown.append((u, v))
+        if w is not None and (old is None or w < old):
+            shrunk.append((u, v))
+
+    # 1) піддерева, що висіли на подовжених/видалених ребрах дерева
+    roots = []
+    for u, v in grown:
+        if prev.get(v) == u:
+            roots.append(v)
+        if not directed and prev.get(u) == v:
+            roots.append(u)
+    affected = set()
+    if roots:
+        children = {}
+        for x, p in prev.items():
+            if p is not None:
+                children.setdefault(p, []).append(x)
+        stack = [r for r in roots if r not in affected]
+        while stack:
+            x = stack.pop()
+            if x in affected:
+                continue
+            affected.add(x)
+            stack.extend(children.get(x, ()))
+    for x in affected:
+        dist[x], prev[x] = float("inf"), None
+
+    pq = []
+    incoming = G.pred if directed else G.adj
+    for x in affected:
+        for y, data in incoming[x].items():
+            if y not in affected:
+                nd = dist[y] + data.get("weight", 1.0)
+                if nd < dist[x]:
+                    dist[x], prev[x] = nd, y
+        if dist[x] < float("inf"):
+            heapq.heappush(pq, (dist[x], x))
+
+    # 2) здешевлені та нові ребра
+    for u, v in shrunk:
+        for a, b in ((u, v),) if directed else ((u, v), (v, u)):
+            if G.has_edge(a, b):
+                nd = dist[a] + G[a][b].get("weight", 1.0)
+                if nd < dist[b]:
+                    dist[b], prev[b] = nd, a
+                    heapq.heappush(pq, (nd, b))
+
+    # 3) ремонт: звичайна Дейкстра лише від змінених вершин
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d != dist[u]:
+            continue
+        for v, data in G[u].items():
+            nd = d + data.get("weight", 1.0)
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(pq, (nd, v))
+    return dist, prev
+
+# -------- Багато джерел паралельно --------
+_worker_graph = None        # CSR-масиви в спільній пам'яті, приєднані у воркері
+_worker_out = None          # відкритий у воркері memmap матриці відстаней
+
+
+def _share(arr):
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+
+def _attach_worker(specs, out):
+    """Ініціалізатор пулу: приєднує CSR-масиви зі спільної пам'яті (без копій і pickle)."""
+    global _worker_graph, _worker_out
+    blocks, arrays = [], []
+    for name, shape, dtype in specs:
+        shm = shared_memory.SharedMemory(name=name)
+        blocks.append(shm)
+        arrays.append(np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    _worker_graph = SimpleNamespace(offsets=arrays[0], targets=arrays[1], weights=arrays[2], _shm=blocks)
+    _worker_out = None if out is None else np.memmap(out[0], dtype=np.float64, mode="r+", shape=out[1])
+
+
+def _attach_local(g, out):
+    global _worker_graph, _worker_out
+    _worker_graph = g
+    _worker_out = None if out is None else np.memmap(out[0], dtype=np.float64, mode="r+", shape=out[1])
+
+
+def _detach_local():
+    """Відпускає граф і memmap, приєднані в поточному процесі через _attach_local."""
+    global _worker_graph, _worker_out
+    _worker_graph = None
+    _worker_out = None
+
+
+def _row_task(task):
+    row_no, source_id = task
+    row = np.array(_dijkstra_csr(_worker_graph, source_id)[0], dtype=np.float64)
+    if _worker_out is not None:
+        _worker_out[row_no] = row
+        _worker_out.flush()
+        return row_no, None
+    return row_no, row
+
+
+def iter_distance_rows(G, sources, n_workers: int | None = None, out_path=None, chunksize: int = 4):
+    """
+    Відстані від багатьох джерел через пул процесів. Граф компілюється в CSR один раз
+    і кладеться у спільну пам'ять, тож воркери його не копіюють і не серіалізують.
+    Видає (source, row) у порядку sources; стовпці row — у порядку CSRGraph.nodes.
+    Якщо задано out_path (вже створений memmap float64 формою (len(sources), n)),
+    воркери пишуть рядки прямо туди, а row дорівнює None.
+    За замовчуванням процесів min(cpu_count, len(sources)).
+    """
+    g = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    sources = list(sources)
+    tasks = [(i, g.index[s]) for i, s in enumerate(sources)]
+    out = None if out_path is None else (os.fspath(out_path), (len(sources), len(g)))
+    if n_workers is None:
+        n_workers = max(1, min(os.cpu_count() or 1, len(sources)))
+    if n_workers == 1:
+        _attach_local(g, out)
+        try:
+            for row_no, row in map(_row_task, tasks):
+                yield sources[row_no], row
+        finally:
+            _detach_local()
+        return
+    shared = [_share(a) for a in (g.offsets, g.targets, g.weights)]
+    try:
+        with Pool(n_workers, initializer=_attach_worker, initargs=([spec for _, spec in shared], out)) as pool:
+            for row_no, row in pool.imap(_row_task, tasks, chunksize):
+                yield sources[row_no], row
+    finally:
+        for shm, _ in shared:
+            shm.close()
+            shm.unlink()
+
+
+def distance_matrix(G, sources, n_workers: int | None = None, out_path=None):
+    """
+    Матриця відстаней len(sources) × n (float64, inf — недосяжно). З out_path результат
+    — memmap-файл на диску, що заповнюється воркерами напряму. Повертає (matrix, nodes).
+    """
+    g = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    sources = list(sources)
+    shape = (len(sources), len(g))
+    if out_path is not None:
+        matrix = np.memmap(out_path, dtype=np.float64, mode="w+", shape=shape)
+        matrix.flush()
+    else:
+        matrix = np.empty(shape, dtype=np.float64)
+    for i, (_, row) in enumerate(iter_distance_rows(g, sources, n_workers, out_path)):
+        if row is not None:
+            matrix[i] = row
+    return matrix, g.nodes
+
+# -------- Кеш результатів --------
+class DijkstraCache:
+    """
+    LRU-кеш (dist, prev) по джерелах поверх dijkstra. Зміни графа робляться через
+    add_edge / set_weight / remove_edge (або invalidate() після зовнішніх змін):
+    кожна підвищує version і скидає кеш. Обмеження — max_entries і/або max_bytes
+    (оцінка розміру словників). Повернуті словники спільні з кешем — не змінюйте їх.
+    """
+
+    def __init__(self, G, max_entries: int = 256, max_bytes: int | None = None):
+        self.G = G
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.version = 0
+        self._entries = OrderedDict()       # source -> (dist, prev, розмір)
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def dijkstra(self, source):
+        entry = self._entries.get(source)
+        if entry is not None:
+            self._entries.move_to_end(source)
+            self.hits += 1
+            return entry[0], entry[1]
+        self.misses += 1
+        dist, prev = dijkstra(self.G, source)
+        size = sys.getsizeof(dist) + sys.getsizeof(prev) + 24 * len(dist)   # + float-значення
+        self._entries[source] = (dist, prev, size)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or
+                                 (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, (_, _, old_size) = self._entries.popitem(last=False)
+            self._bytes -= old_size
+            self.evictions += 1
+        return dist, prev
+
+    def add_edge(self, u, v, weight: float = 1.0):
+        self.G.add_edge(u, v, weight=weight)
+        self.invalidate()
+
+    def set_weight(self, u, v, weight: float):
+        self.G[u][v]["weight"] = weight
+        self.invalidate()
+
+    def remove_edge(self, u, v):
+        self.G.remove_edge(u, v)
+        self.invalidate()
+
+    def invalidate(self):
+        self.version += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "version": self.version, "entries": len(self._entries), "bytes": self._bytes,
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "invalidations": self.invalidations, "hit_rate": self.hits / total if total else 0.0,
+        }
+
+# -------- Запити «точка-точка» --------
+def _adjacency(G, reverse: bool = False):
+    """
+    Повертає (succ, to_key, from_key): succ(u) дає пари (v, w) у внутрішніх ключах;
+    для CSRGraph ключі — цілі id, для networkx — самі мітки вузлів.
+    """
+    if isinstance(G, CSRGraph):
+        g = G.reversed() if reverse else G
+        offsets, targets, weights = memoryview(g.offsets), memoryview(g.targets), memoryview(g.weights)
+
+        def succ(u):
+            for i in range(offsets[u], offsets[u + 1]):
+                yield targets[i], weights[i]
+        return succ, G.index.__getitem__, G.nodes.__getitem__
+    adj = G.pred if reverse and G.is_directed() else G.adj
+
+    def succ(u):
+        for v, data in adj[u].items():
+            yield v, data.get("weight", 1.0)
+    return succ, (lambda v: v), (lambda v: v)
+
+
+def euclidean_heuristic(coords, attr: str = "pos", scale: float = 1.0):
+    """
+    Допустима евристика для A*: евклідова відстань між координатами вузлів × scale.
+    coords — networkx-граф з атрибутом attr у вузлах або словник {вузол: (x, y)}.
+    scale має бути ≤ мінімального відношення вага/довжина ребра, інакше евристика не допустима.
+    """
+    if isinstance(coords, nx.Graph):
+        coords = nx.get_node_attributes(coords, attr)
+
+    def h(u, t):
+        (x1, y1), (x2, y2) = coords[u], coords[t]
+        return scale * ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+    return h
+
+
+def _walk_back(prev, node):
+    path = []
+    while node is not None:
+        path.append(node)
+        node = prev[node]
+    return path
+
+
+def shortest_path(G, source, target, method: str = "dijkstra", heuristic=None, stats=None):
+    """
+    Найкоротший шлях source→target з раннім завершенням, щойно target остаточно
+    встановлено. method: "dijkstra" | "bidirectional" | "astar" (heuristic(u, target) —
+    допустима нижня оцінка, напр. euclidean_heuristic(G)). Працює з networkx і CSRGraph.
+    Повертає (відстань, шлях); для недосяжної вершини — (inf, []).
+    Якщо передано stats (dict), туди пишеться кількість встановлених вершин "settled".
+    """
+    succ, key, label = _adjacency(G)
+    s, t = key(source), key(target)
+    if method == "bidirectional":
+        d, path = _bidirectional(succ, _adjacency(G, reverse=True)[0], s, t, stats)
+    elif method in ("dijkstra", "astar"):
+        if method == "astar":
+            if heuristic is None:
+                raise ValueError("Для A* потрібна heuristic(u, target)")
+            h = lambda v: heuristic(label(v), target)
+        else:
+            h = lambda v: 0.0
+        d, path = _astar(succ, s, t, h, stats)
+    else:
+        raise ValueError(f"Невідомий метод: {method!r}")
+    return d, [label(v) for v in path]
+
+
+def _astar(succ, s, t, h, stats):
+    """A* (за h ≡ 0 — Дейкстра) з лінивим видаленням; вершини можуть перевідкриватися."""
+    dist = {s: 0.0}
+    prev = {s: None}
+    pq = [(h(s), 0.0, s)]
+    settled = 0
+    while pq:
+        _, d, u = heapq.heappop(pq)
+        if d != dist[u]:
+            continue
+        settled += 1
+        if u == t:
+            break
+        for v, w in succ(u):
+            nd = d + w
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(pq, (nd + h(v), nd, v))
+    if stats is not None:
+        stats["settled"] = settled
+    if t not in dist:
+        return float("inf"), []
+    return dist[t], _walk_back(prev, t)[::-1]
+
+
+def _bidirectional(succ, pred, s, t, stats):
+    """Двобічна Дейкстра: зупинка, коли сума верхівок обох куп ≥ найкращого знайденого μ."""
+    dist = ({s: 0.0}, {t: 0.0})
+    prev = ({s: None}, {t: None})
+    pq = ([(0.0, s)], [(0.0, t)])
+    adj = (succ, pred)
+    done = (set(), set())
+    best, meet = (0.0, s) if s == t else (float("inf"), None)
+    while pq[0] and pq[1] and pq[0][0][0] + pq[1][0][0] < best:
+        side = 0 if pq[0][0][0] <= pq[1][0][0] else 1
+        d, u = heapq.heappop(pq[side])
+        if d != dist[side][u]:
+            continue
+        done[side].add(u)
+        other = dist[1 - side]
+        for v, w in adj[side](u):
+            nd = d + w
+            if nd < dist[side].get(v, float("inf")):
+                dist[side][v] = nd
+                prev[side][v] = u
+                heapq.heappush(pq[side], (nd, v))
+            if v in other and nd + other[v] < best:
+                best, meet = nd + other[v], v
+    if stats is not None:
+        stats["settled"] = len(done[0]) + len(done[1])
+    if meet is None:
+        return float("inf"), []
+    forward = _walk_back(prev[0], meet)[::-1]
+    return best, forward + _walk_back(prev[1], meet)[1:]
+
 # -------- Візуалізація --------
-def draw_graph_with_tree(G, dist, prev, start):
-    pos = nx.spring_layout(G, seed=42, k=1.1)
+LABEL_LIMIT = 200          # більше вузлів — без підписів (крім стартового) і без nx-відмальовки
+SPRING_LIMIT = 2_000       # більше вузлів — без O(n²) spring_layout
+
+
+def graph_layout(G, pos=None, layout_path=None):
+    """
+    Координати вузлів: явний pos > кеш у файлі layout_path (.npy) > атрибут вузлів "pos" >
+    spring_layout (для невеликих графів) > random_layout. Обчислене зберігається в layout_path
+    (розширення .npy додається, якщо його немає) разом із відбитком вузлів і ребер
+    у файлі <layout_path>.sha1 — кеш іншого графа не підхопиться.
+    """
+    if pos is not None:
+        return pos
+    nodes = list(G)
+    if layout_path is not None:
+        layout_path = os.fspath(layout_path)
+        if not layout_path.endswith(".npy"):
+            layout_path += ".npy"                    # так само робить np.save
+        key_path = layout_path + ".sha1"
+        digest = hashlib.sha1(repr((nodes, list(G.edges()))).encode()).hexdigest()
+        if os.path.exists(layout_path) and os.path.exists(key_path):
+            with open(key_path) as f:
+                if f.read().strip() == digest:
+                    return dict(zip(nodes, np.load(layout_path)))
+    attr = nx.get_node_attributes(G, "pos")
+    if len(attr) == len(nodes):
+        pos = attr
+    elif len(nodes) <= SPRING_LIMIT:
+        pos = nx.spring_layout(G, seed=42, k=1.1)
+    else:
+        pos = nx.random_layout(G, seed=42)
+    if layout_path is not None:
+        np.save(layout_path, np.array([pos[v] for v in nodes], dtype=np.float64))
+        with open(key_path, "w") as f:               # відбиток — після координат
+            f.write(digest + "\n")
+    return pos
+
+
+def draw_graph_with_tree(G, dist, prev, start, out_path=None, pos=None, layout_path=None,
+                         label_limit: int = LABEL_LIMIT):
+    """
+    Малює граф і дерево НКШ. Малі графи без out_path — як раніше, інтерактивно.
+    З out_path (PNG/SVG/PDF за розширенням) або для великих графів — швидкий шлях:
+    усі ребра однією LineCollection, без підписів понад label_limit вузлів;
+    з out_path рендер іде через Agg без дисплея і без блокувального plt.show().
+    """
+    pos = graph_layout(G, pos, layout_path)
+    if out_path is None and len(G) <= label_limit:
+        _draw_interactive(G, dist, prev, start, pos)
+        return
+    if out_path is None:
+        fig = plt.figure(figsize=(12, 12))
+    else:
+        from matplotlib.figure import Figure       # Agg-полотно, pyplot і дисплей не потрібні
+        fig = Figure(figsize=(12, 12))
+    fig.subplots_adjust(left=0.02, right=0.98, bottom=0.02, top=0.95)   # tight_layout — зайвий прохід рендеру
+    ax = fig.add_subplot()
+    _draw_fast(ax, G, dist, prev, start, pos, label_limit)
+    if out_path is None:
+        plt.show()
+    else:
+        fig.savefig(out_path, dpi=150)
+
+
+def _draw_fast(ax, G, dist, prev, start, pos, label_limit):
+    from matplotlib.collections import LineCollection
+
+    n = len(G)
+    coords = np.array([pos[v] for v in G], dtype=np.float64).reshape(-1, 2)
+    index = {v: i for i, v in enumerate(G)}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    tree = np.array([(index[p], index[v]) for v, p in prev.items() if p is not None],
+                    dtype=np.int64).reshape(-1, 2)
+    thin = max(0.2, min(2.0, 300.0 / max(n, 1)))
+    smooth = n <= label_limit          # згладжування ліній помітно дороге на десятках тисяч ребер
+
+    ax.add_collection(LineCollection(coords[edges], colors="#C0C0C0", linewidths=thin,
+                                     antialiaseds=smooth, zorder=1))
+    ax.add_collection(LineCollection(coords[tree], colors="#1296F0", linewidths=thin * 1.5,
+                                     antialiaseds=smooth, zorder=2))
+    ax.scatter(coords[:, 0], coords[:, 1], s=max(1.0, min(700.0, 60000.0 / max(n, 1))),
+               c="#E8F0FE", edgecolors="#1296F0" if n <= label_limit else "none", zorder=3)
+    if n <= label_limit:
+        for v, (x, y) in zip(G, coords):
+            d = dist[v] if dist[v] != float("inf") else "∞"
+            ax.annotate(f"{v}\n{d}", (x, y), ha="center", va="center", fontsize=8, zorder=4)
+    elif start in index:
+        x, y = coords[index[start]]
+        ax.annotate(str(start), (x, y), ha="center", va="bottom", fontsize=10, zorder=4)
+    ax.set_title(f"Дерево найкоротших шляхів від {start}")
+    ax.autoscale_view()
+    ax.set_aspect("equal", adjustable="datalim")
+    ax.axis("off")
+
 
+def _draw_interactive(G, dist, prev, start, pos):
     # базовий граф
     nx.draw_networkx_nodes(G, pos, node_size=700, node_color="#E8F0FE")
     nx.draw_networkx_edges(G, pos, width=2, edge_color="#C0C0C0")
@@ -84,10 +892,13 @@ def main():
 
     start = "A"
     dist, prev = dijkstra(G, start)
+    assert dijkstra(CSRGraph.from_networkx(G), start) == (dist, prev)
 
     target = "F"
     print("Відстані від", start, ":", dist)
     print(f"Шлях {start}→{target}:", get_path(prev, start, target))
+    for method in ("dijkstra", "bidirectional"):
+        assert shortest_path(G, start, target, method)[0] == dist[target]
 
     draw_graph_with_tree(G, dist, prev, start)
 
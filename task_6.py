@@ -1,3 +1,7 @@
+import math
+from bisect import bisect_right
+from collections import OrderedDict
+
 # ---------- Дані ----------
 items = {
     "pizza":     {"cost": 50, "calories": 300},
@@ -22,7 +26,7 @@ def greedy_algorithm(items, budget):
     for name, p in items.items():
         cost, cal = p["cost"], p["calories"]
         if cost <= budget:
-            scored.append((name, cost, cal, cal / cost))
+            scored.append((name, cost, cal, cal / cost if cost else math.inf))
     scored.sort(key=lambda t: (t[3], t[2]), reverse=True)
 
     total_cal, spent, chosen = 0, 0, []
@@ -34,9 +38,15 @@ def greedy_algorithm(items, budget):
     return total_cal, spent, chosen
 
 # ---------- Динамічне програмування (0/1-рюкзак) ----------
-def dynamic_programming(items, budget):
+def dynamic_programming(items, budget, method="table"):
     """
     Максимізує калорії при обмеженні за вартістю.
+    method="table"  — класична таблиця (n+1) × (budget+1);
+    method="numpy"  — один рядок NumPy на O(budget) + бітсет рішень take/skip
+                      (n·budget біт замість n·budget цілих Python);
+    method="sparse" — лише Парето-оптимальні стани (вартість, калорії): час залежить
+                      від кількості різних досяжних станів, а не від величини бюджету.
+    Вартості й бюджет автоматично діляться на НСД вартостей (напр., усі кратні 5).
     Повертає: (total_calories, spent_cost, chosen_items)
     """
     if budget <= 0:
@@ -47,6 +57,19 @@ def dynamic_programming(items, budget):
     cals   = [items[n]["calories"] for n in names]
     n = len(names)
 
+    # досяжні витрати кратні g, тож dp[i][b] = dp[i][b // g · g] — рахуємо в одиницях g
+    g = math.gcd(*costs)
+    if g > 1:
+        costs = [c // g for c in costs]
+        budget //= g
+
+    if method == "numpy":
+        return _dp_numpy(items, names, costs, cals, budget)
+    if method == "sparse":
+        return _dp_sparse(items, names, costs, cals, budget)
+    if method != "table":
+        raise ValueError(f"Невідомий метод: {method!r}")
+
     # Таблиця dp[i][b] = макс. калорійність, яку можна отримати,
     # використовуючи перші i страв і бюджет b
     dp = [[0] * (budget + 1) for _ in range(n + 1)]
@@ -73,6 +96,393 @@ def dynamic_programming(items, budget):
     spent = sum(items[name]["cost"] for name in chosen)
     return total_cal, spent, chosen
 
+def _dp_numpy(items, names, costs, cals, budget):
+    """Вектори замість подвійного циклу: row[b] = max(row[b], row[b-c] + v) одним зсувом на страву."""
+    import numpy as np
+
+    row = np.zeros(budget + 1, dtype=np.int64)
+    take = np.zeros((len(names), (budget + 8) // 8), dtype=np.uint8)   # упаковані біти рішень
+    for i, (ci, vi) in enumerate(zip(costs, cals)):
+        if ci > budget:
+            continue
+        cand = row[:budget + 1 - ci] + vi          # копія старого рядка — поновлюємо без гонок
+        better = cand > row[ci:]                   # строго більше — як dp[i][b] != dp[i-1][b]
+        row[ci:][better] = cand[better]
+        bits = np.zeros(budget + 1, dtype=bool)
+        bits[ci:] = better
+        take[i] = np.packbits(bits)
+
+    chosen = []
+    b = budget
+    for i in range(len(names) - 1, -1, -1):
+        if (take[i, b >> 3] >> (7 - (b & 7))) & 1:
+            chosen.append(names[i])
+            b -= costs[i]
+    chosen.reverse()
+
+    spent = sum(items[name]["cost"] for name in chosen)
+    return int(row[budget]), spent, chosen
+
+def _dp_sparse(items, names, costs, cals, budget):
+    """
+    Фронт — список (вартість, калорії, ланцюжок) зі строго зростаючими і вартістю, і калоріями.
+    Для кожної страви зливаємо фронт зі зсунутою копією і відкидаємо домінованих:
+    стан виживає, лише якщо дає більше калорій, ніж будь-який дешевший.
+    Ланцюжок (індекс, попередній) — спільні префікси не копіюються.
+    """
+    front = [(0, 0, None)]
+    for i, (ci, vi) in enumerate(zip(costs, cals)):
+        shifted = [(c + ci, v + vi, (i, chain)) for c, v, chain in front if c + ci <= budget]
+        merged = []
+        best = -1
+        a = b = 0
+        while a < len(front) or b < len(shifted):
+            # за рівної вартості першим іде більше калорій; за повної рівності — стан без страви
+            if b == len(shifted) or (a < len(front) and
+                                     (front[a][0], -front[a][1]) <= (shifted[b][0], -shifted[b][1])):
+                state = front[a]
+                a += 1
+            else:
+                state = shifted[b]
+                b += 1
+            if state[1] > best:
+                merged.append(state)
+                best = state[1]
+        front = merged
+
+    _, total_cal, chain = front[-1]            # останній стан фронту — найкалорійніший
+    chosen = []
+    while chain is not None:
+        i, chain = chain
+        chosen.append(names[i])
+    chosen.reverse()
+
+    spent = sum(items[name]["cost"] for name in chosen)
+    return total_cal, spent, chosen
+
+# ---------- Пакетні запити з однієї таблиці ----------
+TABLE_CACHE_SIZE = 8              # скільки меню (за відбитком) тримати в кеші dynamic_programming_batch
+TABLE_CACHE_BYTES = 256 * 2**20   # і скільки байтів таблиць разом
+
+class KnapsackTable:
+    """
+    Повна таблиця dp (рядки NumPy) для одного меню до max_budget: будь-який бюджет
+    ≤ max_budget відповідається відновленням за O(n) без перерахунку. Відповіді
+    збігаються з dynamic_programming(method="table"). Як і там, вартості діляться
+    на їхній НСД g. add_item дописує один рядок (або перебудовує таблицю, якщо
+    нова вартість змінює g), remove_item перераховує лише рядки після видаленої
+    страви; бюджет більший за max_budget перебудовує таблицю.
+    Пам'ять — (n+1)·(max_budget // g + 1)·8 байт (див. nbytes).
+    """
+
+    def __init__(self, items, max_budget: int):
+        import numpy as np
+
+        self._np = np
+        self.items = {name: dict(p) for name, p in items.items()}
+        self.max_budget = max(max_budget, 0)
+        self._build(0)
+
+    @property
+    def fingerprint(self):
+        return _fingerprint(self.items)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(row.nbytes for row in self._rows)
+
+    def _row(self, prev, cost, cal):
+        row = prev.copy()
+        cost //= self._g
+        width = len(prev)
+        if cost < width:
+            self._np.maximum(row[cost:], prev[:width - cost] + cal, out=row[cost:])
+        return row
+
+    def _build(self, start: int):
+        """Перераховує рядки start+1..n; рядки 0..start лишаються. Якщо НСД змінився — усе."""
+        g = math.gcd(*(p["cost"] for p in self.items.values())) or 1
+        if start == 0 or g != self._g:
+            self._g = g
+            self._rows = [self._np.zeros(self.max_budget // g + 1, dtype=self._np.int64)]
+            start = 0
+        del self._rows[start + 1:]
+        for p in list(self.items.values())[start:]:
+            self._rows.append(self._row(self._rows[-1], p["cost"], p["calories"]))
+
+    def add_item(self, name, cost, calories):
+        if name in self.items:
+            raise KeyError(f"Страва {name!r} вже є в меню")
+        self.items[name] = {"cost": cost, "calories": calories}
+        if cost % self._g:
+            self._build(0)                 # нова вартість не ділиться на g
+        else:
+            self._rows.append(self._row(self._rows[-1], cost, calories))
+
+    def remove_item(self, name):
+        idx = list(self.items).index(name)
+        del self.items[name]
+        self._build(idx)
+
+    def reserve(self, max_budget: int):
+        if max_budget > self.max_budget:
+            self.max_budget = max_budget
+            self._build(0)
+
+    def query(self, budget):
+        """Повертає: (total_calories, spent_cost, chosen_items)"""
+        if budget <= 0:
+            return 0, 0, []
+        self.reserve(budget)
+        names = list(self.items)
+        rows = self._rows
+        chosen = []
+        b = budget // self._g
+        for i in range(len(names), 0, -1):
+            if rows[i][b] != rows[i - 1][b]:
+                chosen.append(names[i - 1])
+                b -= self.items[names[i - 1]]["cost"] // self._g
+        chosen.reverse()
+        spent = sum(self.items[name]["cost"] for name in chosen)
+        return int(rows[-1][budget // self._g]), spent, chosen
+
+_TABLE_CACHE = OrderedDict()   # відбиток меню -> KnapsackTable
+
+def _fingerprint(items):
+    return tuple((name, p["cost"], p["calories"]) for name, p in items.items())
+
+def _reuse_table(fp):
+    """Шукає в кеші меню, що відрізняється від fp однією доданою (у кінці) або видаленою стравою."""
+    for old_fp in list(_TABLE_CACHE):
+        if len(old_fp) + 1 == len(fp) and fp[:-1] == old_fp:
+            table = _TABLE_CACHE.pop(old_fp)
+            table.add_item(*fp[-1])
+            return table
+        if len(old_fp) == len(fp) + 1:
+            k = next((k for k, (a, b) in enumerate(zip(old_fp, fp)) if a != b), len(fp))
+            if old_fp[k + 1:] == fp[k:]:
+                table = _TABLE_CACHE.pop(old_fp)
+                table.remove_item(old_fp[k][0])
+                return table
+    return None
+
+def dynamic_programming_batch(items, budgets):
+    """
+    Відповідає на багато бюджетів однією таблицею до max(budgets).
+    Таблиці кешуються за відбитком меню (назва, вартість, калорії) у межах
+    TABLE_CACHE_SIZE штук і TABLE_CACHE_BYTES байтів; меню, що відрізняється
+    від закешованого однією стравою, оновлюється інкрементально.
+    Повертає список (total_calories, spent_cost, chosen_items) у порядку budgets.
+    """
+    budgets = list(budgets)
+    fp = _fingerprint(items)
+    table = _TABLE_CACHE.get(fp)
+    if table is None:
+        table = _reuse_table(fp) or KnapsackTable(items, 0)
+        _TABLE_CACHE[fp] = table
+    _TABLE_CACHE.move_to_end(fp)
+    table.reserve(max(budgets, default=0))
+    # витісняємо найдавніші, поки не вкладемось у ліміти (поточна таблиця лишається)
+    while len(_TABLE_CACHE) > 1 and (len(_TABLE_CACHE) > TABLE_CACHE_SIZE or
+                                     sum(t.nbytes for t in _TABLE_CACHE.values()) > TABLE_CACHE_BYTES):
+        _TABLE_CACHE.popitem(last=False)
+    return [table.query(b) for b in budgets]
+
+# ---------- Гілки й межі ----------
+def branch_and_bound(items, budget, stats=None):
+    """
+    Точний розв'язок без таблиці: пам'ять O(n) незалежно від бюджету.
+    Страви впорядковані як у greedy_algorithm (спадання calories / cost); верхня межа вузла —
+    дробова жадібна релаксація (O(log n) через префіксні суми), початковий рекорд — greedy.
+    Калорії й вартості — цілі, тож межу округлюємо вниз і відтинаємо вузли з межею ≤ рекорду.
+    Якщо передано stats (dict), туди пишуться "nodes", "pruned", "greedy" та "improvements".
+    Повертає: (total_calories, spent_cost, chosen_items)
+    """
+    if budget <= 0:
+        return 0, 0, []
+
+    order = [(name, p["cost"], p["calories"]) for name, p in items.items() if p["cost"] <= budget]
+    order.sort(key=lambda t: (t[2] / t[1] if t[1] else math.inf, t[2]), reverse=True)
+    n = len(order)
+    pc, pv = [0], [0]                                    # префіксні суми вартостей і калорій
+    for _, cost, cal in order:
+        pc.append(pc[-1] + cost)
+        pv.append(pv[-1] + cal)
+
+    def bound(i, cap, val):
+        j = bisect_right(pc, pc[i] + cap, i) - 1         # страви i..j-1 влазять повністю
+        val += pv[j] - pv[i]
+        if j < n:                                        # частка наступної страви
+            val += (pc[i] + cap - pc[j]) * order[j][2] // order[j][1]
+        return val
+
+    best, _, greedy_chosen = greedy_algorithm(items, budget)
+    best_set = set(greedy_chosen)
+    greedy_best = best
+    nodes = pruned = improvements = 0
+
+    stack = [(0, budget, 0, None)]                       # (страва, залишок, калорії, ланцюжок)
+    while stack:
+        i, cap, val, chain = stack.pop()
+        nodes += 1
+        if pc[n] - pc[i] <= cap:                         # решта влазить уся — листок
+            val += pv[n] - pv[i]
+            chain = (range(i, n), chain)
+        elif bound(i, cap, val) <= best:
+            pruned += 1
+            continue
+        else:
+            _, cost, cal = order[i]
+            stack.append((i + 1, cap, val, chain))       # без страви — досліджуємо другою
+            if cost <= cap:
+                stack.append((i + 1, cap - cost, val + cal, ((i,), chain)))
+            continue
+        if val > best:
+            best, improvements = val, improvements + 1
+            best_set = set()
+            while chain is not None:
+                idx, chain = chain
+                best_set.update(order[k][0] for k in idx)
+
+    if stats is not None:
+        stats.update(nodes=nodes, pruned=pruned, greedy=greedy_best,
+                     improvements=improvements)
+    chosen = [name for name in items if name in best_set]
+    spent = sum(items[name]["cost"] for name in chosen)
+    return best, spent, chosen
+
+# ---------- Кілька обмежень і обмежена кількість ----------
+DENSE_MAX_BYTES = 256 * 2**20   # межа пам'яті щільної сітки станів у bounded_knapsack
+
+def _split_quantities(items, limits, value):
+    """
+    Бінарне розбиття: qty = 1 + 2 + 4 + ... + залишок — O(log qty) псевдо-страв
+    замість qty копій; будь-яку кількість 0..qty можна скласти з частин.
+    Повертає список (name, кратність, вектор ресурсів, цінність).
+    """
+    parts = []
+    for name, p in items.items():
+        q, k = p.get("qty", 1), 1
+        while q > 0:
+            m = min(k, q)
+            vec = tuple(p.get(r, 0) * m for r in limits)
+            if all(w <= cap for w, cap in zip(vec, limits.values())):
+                parts.append((name, m, vec, p[value] * m))
+            q -= m
+            k *= 2
+    return parts
+
+def bounded_knapsack(items, limits, value="calories", max_bytes=DENSE_MAX_BYTES):
+    """
+    Максимізує value за кількох обмежень одночасно, напр. limits={"cost": 100, "weight": 500}.
+    Кожна страва: ресурси за ключами limits (відсутній = 0) і "qty" — скільки разів
+    можна взяти (типово 1). Кількості розбиваються бінарно, кожен вимір ділиться на НСД.
+    Стан — щільна сітка NumPy з упакованими бітами рішень, якщо вона разом із бітсетами
+    (по cells / 8 байтів на кожну псевдо-страву) вміщається в max_bytes,
+    інакше словник лише досяжних векторів ресурсів.
+    Повертає: (total_value, spent: {ресурс: витрачено}, chosen: {страва: кількість})
+    """
+    if any(cap < 0 for cap in limits.values()):
+        return 0, {r: 0 for r in limits}, {}
+    parts = _split_quantities(items, limits, value)
+
+    scales = [math.gcd(*(vec[d] for _, _, vec, _ in parts)) or 1 for d in range(len(limits))]
+    caps = tuple(cap // g for cap, g in zip(limits.values(), scales))
+    parts = [(name, m, tuple(w // g for w, g in zip(vec, scales)), v) for name, m, vec, v in parts]
+
+    cells = math.prod(c + 1 for c in caps)
+    # dp і тимчасовий cand (int64), маска better, плюс бітсет на кожну частину
+    dense_bytes = cells * (8 + 8 + 1) + len(parts) * ((cells + 7) // 8)
+    if dense_bytes <= max_bytes:
+        total, taken = _bounded_dense(parts, caps)
+    else:
+        total, taken = _bounded_sparse(parts, caps)
+
+    chosen = {}
+    for name, m in taken:
+        chosen[name] = chosen.get(name, 0) + m
+    chosen = {name: chosen[name] for name in items if name in chosen}
+    spent = {r: sum(items[name].get(r, 0) * k for name, k in chosen.items()) for r in limits}
+    return total, spent, chosen
+
+def _bounded_dense(parts, caps):
+    """Як _dp_numpy, але зсув — по всіх вимірах сітки одразу."""
+    import numpy as np
+
+    shape = tuple(c + 1 for c in caps)
+    dp = np.zeros(shape, dtype=np.int64)
+    take = []
+    for _, _, vec, v in parts:
+        dst = tuple(slice(w, None) for w in vec)
+        cand = dp[tuple(slice(0, c + 1 - w) for w, c in zip(vec, caps))] + v
+        better = cand > dp[dst]
+        dp[dst][better] = cand[better]
+        bits = np.zeros(shape, dtype=bool)
+        bits[dst] = better
+        take.append(np.packbits(bits.ravel()))
+
+    taken = []
+    idx = list(caps)
+    for (name, m, vec, _), bits in zip(reversed(parts), reversed(take)):
+        flat = int(np.ravel_multi_index(idx, shape))
+        if (bits[flat >> 3] >> (7 - (flat & 7))) & 1:
+            taken.append((name, m))
+            idx = [i - w for i, w in zip(idx, vec)]
+    return int(dp[caps]), taken
+
+def _bounded_sparse(parts, caps):
+    """Словник {вектор ресурсів: (цінність, ланцюжок)} — пам'ять ∝ кількості досяжних станів."""
+    states = {tuple(0 for _ in caps): (0, None)}
+    for i, (_, _, vec, v) in enumerate(parts):
+        for key, (val, chain) in list(states.items()):
+            new_key = tuple(a + w for a, w in zip(key, vec))
+            if all(a <= c for a, c in zip(new_key, caps)):
+                old = states.get(new_key)
+                if old is None or val + v > old[0]:
+                    states[new_key] = (val + v, (i, chain))
+
+    total, chain = max(states.values(), key=lambda s: s[0])
+    taken = []
+    while chain is not None:
+        i, chain = chain
+        taken.append(parts[i][:2])
+    return total, taken
+
+def greedy_multi_constraint(items, limits, value="calories"):
+    """
+    Жадібна евристика для bounded_knapsack: страви у порядку спадання
+    value / Σ(ресурс / ліміт), кожну беремо стільки разів, скільки дозволяють qty і залишки.
+    Повертає: (total_value, spent: {ресурс: витрачено}, chosen: {страва: кількість})
+    """
+    spent = {r: 0 for r in limits}
+    if any(cap < 0 for cap in limits.values()):
+        return 0, spent, {}
+
+    def score(p):
+        load = 0.0                                 # частка лімітів, яку з'їдає одна порція
+        for r, cap in limits.items():
+            w = p.get(r, 0)
+            if w > cap:
+                return -math.inf                   # не влазить навіть одна порція
+            if w:
+                load += w / cap
+        return p[value] / load if load else math.inf
+
+    order = sorted(items, key=lambda name: (score(items[name]), items[name][value]), reverse=True)
+    total, chosen = 0, {}
+    for name in order:
+        p = items[name]
+        k = p.get("qty", 1)
+        for r, cap in limits.items():
+            if p.get(r, 0) > 0:
+                k = min(k, (cap - spent[r]) // p[r])
+        if k > 0:
+            chosen[name] = k
+            total += p[value] * k
+            for r in limits:
+                spent[r] += p.get(r, 0) * k
+    return total, spent, chosen
+
 def print_solution(label, result):
     total_cal, total_cost, chosen = result
     print(f"{label}: Набір = {chosen}; Калорійність = {total_cal}; Витрати = {total_cost}")
@@ -86,6 +496,11 @@ if __name__ == "__main__":
     print(f"\nБюджет = {budget}")
     print_solution("Greedy", g_res)
     print_solution("DP optimal", d_res)
+    assert dynamic_programming(items, budget, method="numpy") == d_res
+    assert dynamic_programming(items, budget, method="sparse")[0] == d_res[0]
+    assert branch_and_bound(items, budget)[0] == d_res[0]
+    assert dynamic_programming_batch(items, [budget, 100]) == [d_res, dynamic_programming(items, 100)]
+    assert bounded_knapsack(items, {"cost": budget})[0] == d_res[0]
 
     budget = 100
     print(f"\nБюджет = {budget}")
@@ -1,41 +1,218 @@
 import math
 import random
 from collections import Counter
+from functools import lru_cache
 from typing import Dict, Tuple, List
 
-def simulate_two_dice(n_rolls: int, seed: int = 123) -> Dict[int, int]:
-    """Імітує n_rolls кидків двох кубиків. Повертає лічильники сум 2..12."""
+CHUNK_SIZE = 1_000_000   # кидків за один крок NumPy-бекенду
+
+def simulate_two_dice(n_rolls: int, seed: int = 123, backend: str = "python",
+                      chunk_size: int = CHUNK_SIZE, n_workers: int | None = None,
+                      n_dice: int = 2, faces: int = 6) -> Dict[int, int]:
+    """
+    Імітує n_rolls кидків n_dice кубиків з faces гранями (за замовчуванням — два звичайні).
+    Повертає лічильники сум n_dice..n_dice*faces.
+    backend="python" — цикл з random.randint; backend="numpy" — блоки по chunk_size
+    кидків через numpy.random.Generator + bincount (пам'ять O(chunk_size) за будь-якого N);
+    backend="parallel" — те саме, але N ділиться між n_workers процесами.
+    """
     if n_rolls <= 0:
         raise ValueError("n_rolls має бути > 0")
-    random.seed(seed)
+    if n_dice <= 0 or faces <= 0:
+        raise ValueError("n_dice і faces мають бути > 0")
+    sums = range(n_dice, n_dice * faces + 1)
+    if backend == "numpy":
+        totals = _numpy_totals(n_rolls, seed, chunk_size, n_dice, faces)
+    elif backend == "parallel":
+        totals = _parallel_totals(n_rolls, seed, chunk_size, n_workers, n_dice, faces)
+    elif backend == "python":
+        # локальний генератор: глобальний random не чіпаємо
+        cnt = _python_counts(random.Random(seed), n_rolls, n_dice, faces)
+        return {s: cnt.get(s, 0) for s in sums}
+    else:
+        raise ValueError(f"Невідомий backend: {backend!r}")
+    return {s: int(totals[s]) for s in sums}
+
+def _python_counts(rng: random.Random, n_rolls: int, n_dice: int, faces: int) -> Counter:
     cnt = Counter()
     for _ in range(n_rolls):
-        s = random.randint(1, 6) + random.randint(1, 6)
+        s = 0
+        for _ in range(n_dice):
+            s += rng.randint(1, faces)
         cnt[s] += 1
-    return {s: cnt.get(s, 0) for s in range(2, 13)}
+    return cnt
+
+def _numpy_totals(n_rolls: int, seed, chunk_size: int, n_dice: int = 2, faces: int = 6):
+    """
+    Потокова векторизована імітація: кидки генеруються блоками, а не всі одразу.
+    seed може бути й готовим numpy.random.Generator — тоді потік продовжується.
+    """
+    import numpy as np
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size має бути > 0")
+    rng = np.random.default_rng(seed)
+    dtype = np.int8 if faces < 128 else np.int64
+    totals = np.zeros(n_dice * faces + 1, dtype=np.int64)
+    left = n_rolls
+    while left > 0:
+        size = min(chunk_size, left)
+        dice = rng.integers(1, faces + 1, size=(size, n_dice), dtype=dtype)
+        sums = dice.sum(axis=1, dtype=np.int64)
+        totals += np.bincount(sums, minlength=totals.size)
+        left -= size
+    return totals
+
+def _worker_totals(args):
+    return _numpy_totals(*args)
+
+def _resolve_workers(n_workers: int | None) -> int:
+    import os
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if n_workers <= 0:
+        raise ValueError("n_workers має бути > 0")
+    return n_workers
+
+def _parallel_totals(n_rolls: int, seed: int, chunk_size: int, n_workers: int | None,
+                     n_dice: int = 2, faces: int = 6, pool=None):
+    """
+    Ділить n_rolls між n_workers процесами. Кожен воркер отримує власний незалежний
+    потік SeedSequence(seed).spawn(...), тож результат для (seed, n_workers) відтворюваний
+    незалежно від планування процесів. pool — готовий ProcessPoolExecutor для повторних
+    викликів (інакше пул створюється і закривається тут).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import numpy as np
 
-def analytic_distribution() -> Tuple[Dict[int, int], Dict[int, float]]:
-    """Кількість способів і аналітичні ймовірності для сум 2..12."""
-    ways = {2:1, 3:2, 4:3, 5:4, 6:5, 7:6, 8:5, 9:4, 10:3, 11:2, 12:1}
-    total = 36
-    probs = {s: ways[s] / total for s in range(2, 13)}
+    n_workers = min(_resolve_workers(n_workers), n_rolls)
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    streams = root.spawn(n_workers)
+    base, extra = divmod(n_rolls, n_workers)
+    tasks = [(base + (i < extra), ss, chunk_size, n_dice, faces) for i, ss in enumerate(streams)]
+    if n_workers == 1:
+        return _worker_totals(tasks[0])
+    if pool is not None:
+        return sum(pool.map(_worker_totals, tasks))
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return sum(pool.map(_worker_totals, tasks))
+
+@lru_cache(maxsize=128)
+def _ways(n_dice: int, faces: int) -> Tuple[int, ...]:
+    """
+    Точна кількість способів для сум n_dice..n_dice*faces.
+    Згортка з кубиком — це сума вікна ширини faces, тож кожен крок рахується
+    префіксними сумами за O(довжини) на цілих числах Python (без переповнень).
+    """
+    ways = [1] * faces                       # один кубик: суми 1..faces
+    for _ in range(n_dice - 1):
+        prefix = [0]
+        for w in ways:
+            prefix.append(prefix[-1] + w)
+        m = len(ways)
+        ways = [prefix[min(i + 1, m)] - prefix[max(0, i - faces + 1)] for i in range(m + faces - 1)]
+    return tuple(ways)
+
+def analytic_distribution(n_dice: int = 2, faces: int = 6) -> Tuple[Dict[int, int], Dict[int, float]]:
+    """Кількість способів і аналітичні ймовірності для сум n_dice..n_dice*faces (за замовч. 2..12)."""
+    if n_dice <= 0 or faces <= 0:
+        raise ValueError("n_dice і faces мають бути > 0")
+    ways = dict(zip(range(n_dice, n_dice * faces + 1), _ways(n_dice, faces)))
+    total = faces ** n_dice
+    probs = {s: w / total for s, w in ways.items()}
     return ways, probs
 
-def build_table(counts_mc: Dict[int, int], n_rolls: int):
+def build_table(counts_mc: Dict[int, int], n_rolls: int, n_dice: int = 2, faces: int = 6):
     """Готує табличні рядки з порівнянням MC vs аналітика."""
-    _, p_an = analytic_distribution()
+    _, p_an = analytic_distribution(n_dice, faces)
     rows: List[Tuple[int, float, float, float, float, int]] = []
     sse = 0.0
-    for s in range(2, 13):
-        p_mc = counts_mc[s] / n_rolls
-        pA = p_an[s]
+    for s, pA in p_an.items():
+        c = counts_mc.get(s, 0)
+        p_mc = c / n_rolls
         abs_err = abs(p_mc - pA)
-        rel_err = (abs_err / pA) * 100.0
+        # на довгих хвостах (сотні кубиків) ймовірність може бути нижчою за float
+        rel_err = (abs_err / pA) * 100.0 if pA > 0 else (0.0 if abs_err == 0 else math.inf)
         sse += (p_mc - pA) ** 2
-        rows.append((s, p_mc, pA, abs_err, rel_err, counts_mc[s]))
+        rows.append((s, p_mc, pA, abs_err, rel_err, c))
     rmse = math.sqrt(sse / len(rows))
     return rows, rmse
 
+def simulate_until(target_rmse: float | None = None, target_rel_err: float | None = None,
+                   batch_size: int = 100_000, max_rolls: int = 100_000_000, seed: int = 123,
+                   backend: str = "python", n_dice: int = 2, faces: int = 6, z: float = 1.96,
+                   chunk_size: int = CHUNK_SIZE, n_workers: int | None = None):
+    """
+    Послідовний Монте-Карло: кидає партіями по batch_size і зупиняється, щойно
+    RMSE з build_table ≤ target_rmse або найбільша відносна напівширина
+    довірчого інтервалу (у %, як «Rel err %» у таблиці) ≤ target_rel_err.
+    Повертає (counts, n_used, rmse, ci), де ci[s] = (нижня, верхня) межа для p(s)
+    за нормальним наближенням з множником z. Відносна напівширина рахується лише для
+    сум, які вже випадали: для нульових лічильників вона нескінченна, і з багатьма
+    кубиками (далекі хвости) target_rel_err інакше ніколи б не спрацював.
+    backend="parallel" тримає один пул процесів на весь прогін.
+    """
+    if target_rmse is None and target_rel_err is None:
+        raise ValueError("Потрібно задати target_rmse або target_rel_err")
+    if batch_size <= 0 or max_rolls <= 0:
+        raise ValueError("batch_size і max_rolls мають бути > 0")
+    sums = range(n_dice, n_dice * faces + 1)
+    pool = None
+    if backend == "python":
+        rng = random.Random(seed)
+        def next_batch(n):
+            cnt = _python_counts(rng, n, n_dice, faces)
+            return [cnt.get(s, 0) for s in sums]
+    elif backend in ("numpy", "parallel"):
+        import numpy as np
+        if backend == "numpy":
+            gen = np.random.default_rng(seed)      # один потік на весь прогін
+            def next_batch(n):
+                return _numpy_totals(n, gen, chunk_size, n_dice, faces)[n_dice:]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            workers = _resolve_workers(n_workers)
+            if workers > 1:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            root = np.random.SeedSequence(seed)    # кожна партія — новий дочірній потік
+            def next_batch(n):
+                (ss,) = root.spawn(1)
+                return _parallel_totals(n, ss, chunk_size, workers, n_dice, faces, pool)[n_dice:]
+    else:
+        raise ValueError(f"Невідомий backend: {backend!r}")
+
+    try:
+        return _sequential_loop(next_batch, sums, target_rmse, target_rel_err, batch_size,
+                                max_rolls, n_dice, faces, z)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+def _sequential_loop(next_batch, sums, target_rmse, target_rel_err, batch_size, max_rolls,
+                     n_dice, faces, z):
+    totals = [0] * len(sums)
+    n_used = 0
+    while True:
+        n = min(batch_size, max_rolls - n_used)
+        for i, c in enumerate(next_batch(n)):
+            totals[i] += int(c)
+        n_used += n
+        counts = dict(zip(sums, totals))
+        rows, rmse = build_table(counts, n_used, n_dice, faces)
+        ci = {}
+        worst_rel = 0.0
+        for s, p_mc, *_ in rows:
+            half = z * math.sqrt(p_mc * (1.0 - p_mc) / n_used)
+            ci[s] = (max(0.0, p_mc - half), min(1.0, p_mc + half))
+            if p_mc > 0:
+                worst_rel = max(worst_rel, half / p_mc * 100.0)
+        done = (target_rmse is not None and rmse <= target_rmse) or \
+               (target_rel_err is not None and worst_rel <= target_rel_err)
+        if done or n_used >= max_rolls:
+            return counts, n_used, rmse, ci
+
 def print_table(rows):
     print(f"{'Sum':>3} | {'MC prob':>9} | {'Analytic':>9} | {'Abs err':>9} | {'Rel err %':>9} | {'MC count':>8}")
     print("-" * 64)
@@ -77,6 +254,10 @@ if __name__ == "__main__":
     rows, rmse = build_table(counts, N)
     print_table(rows)
     print(f"\nRMSE (Monte Carlo vs аналітика): {rmse:.6f}")
+
+    # Послідовний режим: зупиняємось, щойно RMSE ≤ 5e-4
+    _, n_used, rmse_seq, _ = simulate_until(target_rmse=5e-4, backend="numpy", seed=123)
+    print(f"Ранній стоп: RMSE={rmse_seq:.6f} після {n_used:,} кидків")
     plot(rows, title=f"Two dice: Monte Carlo vs Analytic (N={N:,})")
 
 # Висновки 